@@ -5,11 +5,17 @@ Handles both Niko and Duco devices with proper serialization
 
 import json
 import logging
+from contextlib import contextmanager
 from datetime import datetime
-from typing import Optional, Type, TypeVar, List, Dict, Any
+from typing import Optional, Type, TypeVar, List, Dict, Any, Tuple
 
 import redis
 
+try:
+    import orjson
+except ImportError:  # Optional: fall back to stdlib json
+    orjson = None
+
 from datastructures.duco import (
     BaseDevice, DucoBoxSystem, DucoNode,
     serialize_device, deserialize_device
@@ -57,6 +63,8 @@ class UnifiedRedisPublisher:
             redis_db: int = 0,
             key_prefix: Optional[str] = None,
             enable_pubsub: bool = True,
+            enable_streams: bool = False,
+            stream_maxlen: int = 10000,
             logger: Optional[logging.Logger] = None
     ):
         """
@@ -68,18 +76,38 @@ class UnifiedRedisPublisher:
             redis_db: Redis database number
             key_prefix: Optional prefix for all keys
             enable_pubsub: Enable pub/sub notifications
+            enable_streams: Also append updates to a capped Redis Stream per key
+                (stream:<key>), which consumers can read with XREAD/XREADGROUP
+                without missing updates while disconnected
+            stream_maxlen: Approximate maximum length of each update stream
             logger: Optional logger instance
         """
         self.redis_client = redis.Redis(
             host=redis_host,
             port=redis_port,
             db=redis_db,
-            decode_responses=True
+            decode_responses=True,
+            # Keep the long-lived connection alive and re-check it after idle
+            # periods, instead of failing the first command after a silent drop
+            socket_keepalive=True,
+            health_check_interval=30
         )
         self.key_prefix = key_prefix
         self.enable_pubsub = enable_pubsub
+        self.enable_streams = enable_streams
+        self.stream_maxlen = stream_maxlen
         self.logger = logger or logging.getLogger(__name__)
 
+    @contextmanager
+    def pipeline_context(self):
+        """
+        Yield a non-transactional pipeline that is executed on exit, so several
+        publish_device()/delete_device() calls given pipe= share one round trip.
+        """
+        pipe = self.redis_client.pipeline(transaction=False)
+        yield pipe
+        pipe.execute()
+
     def _build_key(self, pattern_name: str, **kwargs) -> str:
         """Build Redis key from pattern template"""
         pattern = self.KEY_PATTERNS.get(pattern_name, pattern_name)
@@ -96,11 +124,61 @@ class UnifiedRedisPublisher:
             data['timestamp'] = datetime.now().isoformat()
         return data
 
+    @staticmethod
+    def _serialize(data: Dict[str, Any]):
+        """Serialize data to compact JSON, using orjson when it is installed"""
+        if orjson is not None:
+            return orjson.dumps(data, default=str, option=orjson.OPT_NON_STR_KEYS)
+        return json.dumps(data, default=str, separators=(',', ':'))
+
+    def _queue_write(self, pipe, key: str, serialized, ttl: Optional[int]):
+        """Queue a key write (and its pub/sub notification) on a pipeline"""
+        if ttl and ttl > 0:
+            pipe.setex(key, ttl, serialized)
+        else:
+            pipe.set(key, serialized)
+
+        if self.enable_pubsub:
+            pipe.publish(f"updates:{key}", serialized)
+
+        if self.enable_streams:
+            pipe.xadd(f"stream:{key}", {'data': serialized}, maxlen=self.stream_maxlen, approximate=True)
+
+    def _queue_writes(self, pipe, entries: List[tuple]):
+        """
+        Queue many key writes on a pipeline.
+
+        Keys without a TTL are written with a single MSET; keys with a TTL
+        still need one SETEX each, since MSET cannot set expiry.
+
+        Args:
+            pipe: Redis pipeline
+            entries: List of tuples (key, serialized, ttl)
+        """
+        persistent = {}
+        for key, serialized, ttl in entries:
+            if ttl and ttl > 0:
+                pipe.setex(key, ttl, serialized)
+            else:
+                persistent[key] = serialized
+
+        if persistent:
+            pipe.mset(persistent)
+
+        if self.enable_pubsub:
+            for key, serialized, _ in entries:
+                pipe.publish(f"updates:{key}", serialized)
+
+        if self.enable_streams:
+            for key, serialized, _ in entries:
+                pipe.xadd(f"stream:{key}", {'data': serialized}, maxlen=self.stream_maxlen, approximate=True)
+
     def publish_device(
             self,
             device: Any,
             pattern_name: str,
             ttl: Optional[int] = None,
+            pipe=None,
             **key_params
     ) -> bool:
         """
@@ -110,10 +188,12 @@ class UnifiedRedisPublisher:
             device: Device dataclass instance (Niko or Duco)
             pattern_name: Key pattern name from KEY_PATTERNS
             ttl: Time to live (None = use default, 0 = no expiration)
+            pipe: Optional pipeline (see pipeline_context()) to queue the
+                write on; it is then sent when that pipeline executes
             **key_params: Parameters for key pattern
 
         Returns:
-            True if successful
+            True if successful (queued, when pipe is given)
         """
         try:
             # Serialize device
@@ -123,7 +203,7 @@ class UnifiedRedisPublisher:
                 data = serialize_device(device)
 
             data = self._add_timestamp(data)
-            serialized = json.dumps(data, default=str)
+            serialized = self._serialize(data)
 
             # Build key
             key = self._build_key(pattern_name, **key_params)
@@ -132,16 +212,13 @@ class UnifiedRedisPublisher:
             if ttl is None:
                 ttl = self.DEFAULT_TTLS.get(pattern_name, 0)
 
-            # Store in Redis
-            if ttl and ttl > 0:
-                self.redis_client.setex(key, ttl, serialized)
+            # Store in Redis and notify pub/sub in one round trip
+            if pipe is not None:
+                self._queue_write(pipe, key, serialized, ttl)
             else:
-                self.redis_client.set(key, serialized)
-
-            # Publish to pub/sub if enabled
-            if self.enable_pubsub:
-                channel = f"updates:{key}"
-                self.redis_client.publish(channel, serialized)
+                pipe = self.redis_client.pipeline(transaction=False)
+                self._queue_write(pipe, key, serialized, ttl)
+                pipe.execute()
 
             self.logger.debug(f"Published {device.__class__.__name__} to {key}")
             return True
@@ -178,11 +255,11 @@ class UnifiedRedisPublisher:
             self.logger.error(f"Error retrieving device: {e}", exc_info=True)
             return None
 
-    def delete_device(self, pattern_name: str, **key_params) -> bool:
-        """Delete a device from Redis"""
+    def delete_device(self, pattern_name: str, pipe=None, **key_params) -> bool:
+        """Delete a device from Redis (queued on pipe, if given)"""
         try:
             key = self._build_key(pattern_name, **key_params)
-            self.redis_client.delete(key)
+            (pipe if pipe is not None else self.redis_client).delete(key)
             return True
         except Exception as e:
             self.logger.error(f"Error deleting device: {e}")
@@ -207,6 +284,39 @@ class UnifiedRedisPublisher:
             self.logger.error(f"Error listing keys: {e}")
             return []
 
+    def get_many(self, keys: List[str]) -> List[Optional[Dict[str, Any]]]:
+        """
+        Fetch and deserialize several keys with a single MGET round trip.
+
+        Args:
+            keys: Full Redis keys
+
+        Returns:
+            One entry per key, None where the key is missing or unreadable
+        """
+        if not keys:
+            return []
+
+        try:
+            values = self.redis_client.mget(keys)
+        except Exception as e:
+            self.logger.error(f"Error fetching keys: {e}")
+            return [None] * len(keys)
+
+        results = []
+        for key, data in zip(keys, values):
+            try:
+                results.append(json.loads(data) if data else None)
+            except Exception as e:
+                self.logger.error(f"Error loading data from {key}: {e}")
+                results.append(None)
+        return results
+
+    def _get_all(self, pattern_name: str, **wildcards) -> List[Dict[str, Any]]:
+        """Fetch every key matching a pattern in one MGET, skipping missing keys"""
+        keys = self.list_keys(pattern_name, **wildcards)
+        return [data for data in self.get_many(keys) if data is not None]
+
     # ========================================================================
     # DUCO Methods
     # ========================================================================
@@ -238,26 +348,23 @@ class UnifiedRedisPublisher:
     def publish_duco_network(self, nodes: List[DucoNode]) -> int:
         """Publish multiple DUCO nodes efficiently"""
         success_count = 0
-        pipe = self.redis_client.pipeline()
+        entries = []
 
         for node in nodes:
             try:
                 data = serialize_device(node)
                 data = self._add_timestamp(data)
-                serialized = json.dumps(data, default=str)
+                serialized = self._serialize(data)
                 key = self._build_key('duco_node', node_id=node.node_id)
 
-                ttl = self.DEFAULT_TTLS.get('duco_node', 0)
-                if ttl:
-                    pipe.setex(key, ttl, serialized)
-                else:
-                    pipe.set(key, serialized)
-
+                entries.append((key, serialized, self.DEFAULT_TTLS.get('duco_node', 0)))
                 success_count += 1
             except Exception as e:
                 self.logger.error(f"Error preparing node {node.node_id}: {e}")
 
         try:
+            pipe = self.redis_client.pipeline(transaction=False)
+            self._queue_writes(pipe, entries)
             pipe.execute()
         except Exception as e:
             self.logger.error(f"Error executing pipeline: {e}")
@@ -267,16 +374,19 @@ class UnifiedRedisPublisher:
 
     def get_all_duco_nodes(self) -> List[Dict]:
         """Get all DUCO nodes"""
-        keys = self.list_keys('duco_node', node_id='*')
-        nodes = []
-        for key in keys:
-            try:
-                data = self.redis_client.get(key)
-                if data:
-                    nodes.append(json.loads(data))
-            except Exception as e:
-                self.logger.error(f"Error loading node from {key}: {e}")
-        return nodes
+        return self._get_all('duco_node', node_id='*')
+
+    def get_duco_snapshot(self, device_id: str = "ducobox_main") -> Tuple[Optional[Dict], List[Dict]]:
+        """
+        Get the DucoBox system data and all DUCO nodes, read together in one MGET.
+
+        Returns:
+            (ducobox data or None, list of node data)
+        """
+        ducobox_key = self._build_key('ducobox_system', device_id=device_id)
+        node_keys = self.list_keys('duco_node', node_id='*')
+        ducobox, *nodes = self.get_many([ducobox_key] + node_keys)
+        return ducobox, [node for node in nodes if node is not None]
 
     # ========================================================================
     # Niko Methods
@@ -290,11 +400,12 @@ class UnifiedRedisPublisher:
             device_uuid=device.uuid
         )
 
-    def publish_niko_location(self, location: Location) -> bool:
+    def publish_niko_location(self, location: Location, pipe=None) -> bool:
         """Publish Niko location data"""
         return self.publish_device(
             location,
             'niko_location',
+            pipe=pipe,
             location_uuid=location.uuid
         )
 
@@ -309,21 +420,23 @@ class UnifiedRedisPublisher:
     def publish_all_niko_devices(self, devices: List[NikoBaseDevice]) -> int:
         """Publish multiple Niko devices efficiently"""
         success_count = 0
-        pipe = self.redis_client.pipeline()
+        entries = []
 
         for device in devices:
             try:
                 data = device.to_dict()
                 data = self._add_timestamp(data)
-                serialized = json.dumps(data, default=str)
+                serialized = self._serialize(data)
                 key = self._build_key('niko_device', device_uuid=device.uuid)
 
-                pipe.set(key, serialized)
+                entries.append((key, serialized, self.DEFAULT_TTLS.get('niko_device')))
                 success_count += 1
             except Exception as e:
                 self.logger.error(f"Error preparing device {device.uuid}: {e}")
 
         try:
+            pipe = self.redis_client.pipeline(transaction=False)
+            self._queue_writes(pipe, entries)
             pipe.execute()
         except Exception as e:
             self.logger.error(f"Error executing pipeline: {e}")
@@ -333,29 +446,11 @@ class UnifiedRedisPublisher:
 
     def get_all_niko_devices(self) -> List[Dict]:
         """Get all Niko devices"""
-        keys = self.list_keys('niko_device', device_uuid='*')
-        devices = []
-        for key in keys:
-            try:
-                data = self.redis_client.get(key)
-                if data:
-                    devices.append(json.loads(data))
-            except Exception as e:
-                self.logger.error(f"Error loading device from {key}: {e}")
-        return devices
+        return self._get_all('niko_device', device_uuid='*')
 
     def get_all_niko_locations(self) -> List[Dict]:
         """Get all Niko locations"""
-        keys = self.list_keys('niko_location', location_uuid='*')
-        locations = []
-        for key in keys:
-            try:
-                data = self.redis_client.get(key)
-                if data:
-                    locations.append(json.loads(data))
-            except Exception as e:
-                self.logger.error(f"Error loading location from {key}: {e}")
-        return locations
+        return self._get_all('niko_location', location_uuid='*')
 
     # ========================================================================
     # Batch Operations
@@ -372,7 +467,7 @@ class UnifiedRedisPublisher:
             Dict with success and failure counts
         """
         results = {'success': 0, 'failed': 0}
-        pipe = self.redis_client.pipeline()
+        entries = []
 
         for device, pattern_name, key_params in items:
             try:
@@ -382,20 +477,18 @@ class UnifiedRedisPublisher:
                     data = serialize_device(device)
 
                 data = self._add_timestamp(data)
-                serialized = json.dumps(data, default=str)
+                serialized = self._serialize(data)
                 key = self._build_key(pattern_name, **key_params)
 
-                ttl = self.DEFAULT_TTLS.get(pattern_name, 0)
-                if ttl:
-                    pipe.setex(key, ttl, serialized)
-                else:
-                    pipe.set(key, serialized)
+                entries.append((key, serialized, self.DEFAULT_TTLS.get(pattern_name, 0)))
 
             except Exception as e:
                 self.logger.error(f"Error preparing item: {e}")
                 results['failed'] += 1
 
         try:
+            pipe = self.redis_client.pipeline(transaction=False)
+            self._queue_writes(pipe, entries)
             pipe.execute()
             results['success'] = len(items) - results['failed']
         except Exception as e:
@@ -99,7 +99,7 @@ class VentilationMode(IntEnum):
     MANUAL_3_X3 = 16
 
 
-@dataclass
+@dataclass(slots=True)
 class BaseComponent:
     """Base class for all DUCO components"""
     device_id: str
@@ -132,7 +132,7 @@ class BaseComponent:
         return data
 
 
-@dataclass
+@dataclass(slots=True)
 class DucoBoxSystem(BaseComponent):
     """DucoBox system-level component"""
     status: Optional[Literal[0, 1, 2]] = None  # OK=0, ERROR=1, INACTIVE=2
@@ -154,7 +154,7 @@ class DucoBoxSystem(BaseComponent):
     temperature_eha: Optional[float] = None  # Exhaust air
 
 
-@dataclass
+@dataclass(slots=True)
 class DucoNode(BaseComponent):
     """Individual node/valve/sensor in DUCO network"""
     node_id: int = 0
@@ -211,6 +211,33 @@ class DucoModbusClient:
     # Write action limits
     WRITE_INTERVAL = 2  # seconds between writes
 
+    # Node presence bit fields (INPUT registers 0-8, 16 nodes each)
+    ACTIVE_NODE_REGISTERS = 9
+
+    # Map enum names to more readable versions
+    _NODE_TYPE_NAME_MAP = {
+        'CONTROL_SWITCH_RF_BAT': 'Control Switch (RF/Battery)',
+        'CONTROL_SWITCH_RF_WIRED': 'Control Switch (RF/Wired)',
+        'HUMIDITY_ROOM_SENSOR': 'Humidity Room Sensor',
+        'CO2_ROOM_SENSOR': 'CO2 Room Sensor',
+        'SENSORLESS_VALVE': 'Sensorless Valve',
+        'HUMIDITY_VALVE': 'Humidity Valve',
+        'CO2_VALVE': 'CO2 Valve',
+        'SWITCH_CONTACT': 'Switch Contact',
+        'IAV_VALVE': 'iAV Valve',
+        'IAV_HUMIDITY': 'iAV Humidity',
+        'IAV_CO2': 'iAV CO2',
+        'CO2_RH_VALVE': 'CO2/RH Valve',
+        'HUMIDITY_BOX_SENSOR': 'Humidity Box Sensor',
+        'CO2_BOX_SENSOR': 'CO2 Box Sensor',
+        'DUCOTRONIC_GRILLE': 'Ducotronic Grille',
+        'CONTROL_UNIT': 'Control Unit',
+        'SUN_CONTROL_SWITCH': 'Sun Control Switch',
+        'VENTILATIVE_COOLING_SWITCH': 'Ventilative Cooling Switch',
+        'EXTERNAL_MULTIZONE_VALVE': 'External Multizone Valve',
+        'WEATHER_STATION': 'Weather Station',
+    }
+
     def __init__(self, host: str, port: int = DEFAULT_PORT,
                  unit_id: int = 1, register_offset: int = 0):
         """
@@ -306,6 +333,36 @@ class DucoModbusClient:
                 print(f"Exception reading INPUT register {register}: {e}")
             return None
 
+    def read_input_registers(self, register: int, count: int, no_shift: bool = False,
+                             debug: bool = False) -> Optional[List[int]]:
+        """Read a block of consecutive INPUT registers in a single request"""
+        try:
+            kwargs = {'address': self._adjust_register(register, no_shift=no_shift), 'count': count}
+
+            if self._use_unit_param == 'unit':
+                kwargs['unit'] = self.unit_id
+            elif self._use_unit_param == 'slave':
+                kwargs['slave'] = self.unit_id
+
+            if debug:
+                print(
+                    f"Reading {count} INPUT registers from {register} "
+                    f"(adjusted: {self._adjust_register(register, no_shift=no_shift)})")
+
+            result = self.client.read_input_registers(**kwargs)
+
+            if hasattr(result, 'isError') and result.isError():
+                return None
+            registers = getattr(result, 'registers', None)
+            if registers and len(registers) >= count:
+                return list(registers[:count])
+
+            return None
+        except Exception as e:
+            if debug:
+                print(f"Exception reading INPUT registers {register}-{register + count - 1}: {e}")
+            return None
+
     def read_holding_register(self, register: int, debug: bool = False) -> Optional[int]:
         """Read a single HOLDING register"""
         try:
@@ -703,18 +760,23 @@ class DucoModbusClient:
     def get_active_nodes(self) -> List[int]:
         """
         Get list of active node numbers in the network
-        Scans INPUT registers 0-8 for node presence bit fields
+        Reads INPUT registers 0-8 (node presence bit fields) in one request
 
         Each register covers 16 nodes:
         - Register 0: nodes 0-15
         - Register 1: nodes 16-31
         - Register 3: nodes 48-63 (your node 52 example)
         """
+        values = self.read_input_registers(self.register_offset, self.ACTIVE_NODE_REGISTERS)
+        if values is None:
+            # Fall back to one request per register
+            values = [self.read_input_register(reg + self.register_offset)
+                      for reg in range(self.ACTIVE_NODE_REGISTERS)]
+
         active_nodes = []
 
-        for reg in range(0, 9):
-            value = self.read_input_register(reg + self.register_offset)
-            if value is not None:
+        for reg, value in enumerate(values):
+            if value:
                 base_node = reg * 16
 
                 for bit in range(16):
@@ -723,7 +785,7 @@ class DucoModbusClient:
                         if 1 <= node_num <= 143:
                             active_nodes.append(node_num)
 
-        return sorted(active_nodes)
+        return active_nodes
 
     def scan_network(self) -> Dict[int, NodeType]:
         """Scan network and return dictionary of active nodes with their types"""
@@ -859,31 +921,7 @@ class DucoModbusClient:
         if not node_type:
             return "Unknown"
 
-        # Map enum names to more readable versions
-        type_map = {
-            'CONTROL_SWITCH_RF_BAT': 'Control Switch (RF/Battery)',
-            'CONTROL_SWITCH_RF_WIRED': 'Control Switch (RF/Wired)',
-            'HUMIDITY_ROOM_SENSOR': 'Humidity Room Sensor',
-            'CO2_ROOM_SENSOR': 'CO2 Room Sensor',
-            'SENSORLESS_VALVE': 'Sensorless Valve',
-            'HUMIDITY_VALVE': 'Humidity Valve',
-            'CO2_VALVE': 'CO2 Valve',
-            'SWITCH_CONTACT': 'Switch Contact',
-            'IAV_VALVE': 'iAV Valve',
-            'IAV_HUMIDITY': 'iAV Humidity',
-            'IAV_CO2': 'iAV CO2',
-            'CO2_RH_VALVE': 'CO2/RH Valve',
-            'HUMIDITY_BOX_SENSOR': 'Humidity Box Sensor',
-            'CO2_BOX_SENSOR': 'CO2 Box Sensor',
-            'DUCOTRONIC_GRILLE': 'Ducotronic Grille',
-            'CONTROL_UNIT': 'Control Unit',
-            'SUN_CONTROL_SWITCH': 'Sun Control Switch',
-            'VENTILATIVE_COOLING_SWITCH': 'Ventilative Cooling Switch',
-            'EXTERNAL_MULTIZONE_VALVE': 'External Multizone Valve',
-            'WEATHER_STATION': 'Weather Station',
-        }
-
-        return type_map.get(node_type.name, node_type.name.replace('_', ' ').title())
+        return self._NODE_TYPE_NAME_MAP.get(node_type.name, node_type.name.replace('_', ' ').title())
 
     # ===== CONVENIENCE METHODS =====
 
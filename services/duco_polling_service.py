@@ -22,6 +22,27 @@ class DucoPollingService:
     Reads system and node data via Modbus TCP and publishes to Redis.
     """
 
+    # DucoBoxSystem attribute for each key of the combined system read
+    DUCOBOX_FIELD_MAP = {
+        'ventilation_status': 'status',
+        'ventilation_mode': 'ventilation_mode',
+        'humidity': 'humidity_level',
+        'co2': 'co2_level',
+        'air_quality_rh': 'air_quality_rh',
+        'air_quality_co2': 'air_quality_co2',
+        'filter_remaining_time': 'remaining_filter_time',
+        'filter_status': 'filter_status',
+        'outdoor_air': 'temperature_oda',
+        'supply_air': 'temperature_sup',
+        'extract_air': 'temperature_eta',
+        'exhaust_air': 'temperature_eha',
+        'api_version': 'api_version',
+        'remaining_write_actions': 'remaining_write_actions',
+    }
+
+    # Attributes stored as raw status codes instead of enums
+    DUCOBOX_CODE_FIELDS = ('status', 'filter_status')
+
     def __init__(
             self,
             duco_client: DucoModbusClient,
@@ -45,12 +66,17 @@ class DucoPollingService:
 
         self.running = False
         self.thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
 
         # Cache for node IDs
         self.active_nodes: List[int] = []
-        self.last_network_scan: Optional[datetime] = None
+        self._last_scan_monotonic: Optional[float] = None
         self.network_scan_interval = 300  # Re-scan network every 5 minutes
 
+        # DucoBox Energy register groups, probed on each network scan
+        self._supports_temps = True
+        self._supports_filter = True
+
         # Statistics
         self.stats = {
             'polls': 0,
@@ -61,6 +87,14 @@ class DucoPollingService:
             'last_error': None
         }
 
+        # Wall-clock time of the last poll, formatted lazily in get_statistics()
+        self._last_poll_ts: Optional[float] = None
+
+        # Error log deduplication: full tracebacks only when the error changes
+        self.error_traceback_interval = 60  # seconds
+        self._last_err_hash: Optional[int] = None
+        self._last_err_time = 0.0
+
     def start(self):
         """Start the polling service"""
         if self.running:
@@ -68,6 +102,7 @@ class DucoPollingService:
             return
 
         self.running = True
+        self._stop_event.clear()
         self.thread = threading.Thread(target=self._run_loop, daemon=True)
         self.thread.start()
         self.logger.info(f"Duco polling service started (interval: {self.poll_interval}s)")
@@ -78,18 +113,22 @@ class DucoPollingService:
             return
 
         self.running = False
+        self._stop_event.set()
         if self.thread:
             self.thread.join(timeout=5)
         self.logger.info("Duco polling service stopped")
 
     def _run_loop(self):
         """Main polling loop"""
+        # Fixed-period schedule on the monotonic clock, so poll duration does not cause drift
+        next_deadline = time.monotonic() + self.poll_interval
+
         while self.running:
             try:
                 # Check if we need to rescan the network
                 should_rescan = (
-                    self.last_network_scan is None or
-                    (datetime.now() - self.last_network_scan).total_seconds() > self.network_scan_interval
+                    self._last_scan_monotonic is None or
+                    time.monotonic() - self._last_scan_monotonic > self.network_scan_interval
                 )
 
                 if should_rescan:
@@ -101,7 +140,7 @@ class DucoPollingService:
 
                 # Update statistics
                 self.stats['polls'] += 1
-                self.stats['last_poll'] = datetime.now().isoformat()
+                self._last_poll_ts = time.time()
 
             except Exception as e:
                 self.logger.error(f"Error in polling loop: {e}", exc_info=True)
@@ -111,22 +150,69 @@ class DucoPollingService:
                     'error': str(e)
                 }
 
-            # Wait for next poll (check running flag every second for quick shutdown)
-            for _ in range(self.poll_interval):
-                if not self.running:
-                    break
-                time.sleep(1)
+            # Wait for next poll slot (stop() sets the event for quick shutdown)
+            delay = next_deadline - time.monotonic()
+            if delay < 0:
+                missed = int(-delay // self.poll_interval) + 1
+                self.logger.warning(
+                    f"Poll cycle overran by {-delay:.1f}s, skipping {missed} missed slot(s)"
+                )
+                next_deadline += missed * self.poll_interval
+                delay = next_deadline - time.monotonic()
+
+            self._stop_event.wait(max(0.0, delay))
+            next_deadline += self.poll_interval
+
+    def _log_err(self, exc: Exception, message: str, *args):
+        """
+        Log a polling error without formatting a traceback on every repeat.
+
+        The traceback is only included when the error signature (message,
+        its arguments such as the node, and the exception) changes or
+        error_traceback_interval seconds have passed; repeats go to DEBUG.
+        message is a %-style format, so suppressed repeats are not formatted
+        unless DEBUG is enabled.
+        """
+        err_hash = hash((message, args, type(exc), str(exc)))
+        now = time.monotonic()
+
+        if err_hash != self._last_err_hash or now - self._last_err_time > self.error_traceback_interval:
+            self._last_err_hash = err_hash
+            self._last_err_time = now
+            self.logger.error(f"{message}: %s", *args, exc, exc_info=exc)
+        else:
+            self.logger.debug(f"{message}: %s", *args, exc)
 
     def _scan_network(self):
         """Scan for active nodes in the network"""
         try:
             self.logger.info("Scanning Duco network for active nodes...")
             self.active_nodes = self.duco_client.get_active_nodes()
-            self.last_network_scan = datetime.now()
+            self._last_scan_monotonic = time.monotonic()
             self.logger.info(f"Found {len(self.active_nodes)} active nodes: {self.active_nodes}")
         except Exception as e:
             self.logger.error(f"Error scanning network: {e}")
 
+        self._detect_system_capabilities()
+
+    def _detect_system_capabilities(self):
+        """
+        Probe which DucoBox Energy register groups the box answers.
+        Non-Energy boxes return nothing for temperatures and filter info,
+        so those reads are skipped in _poll_system until the next scan.
+        """
+        try:
+            system_type = self.duco_client.get_system_type()
+            self._supports_temps = self.duco_client.get_temperature_oda() is not None
+            self._supports_filter = self.duco_client.get_filter_status() is not None
+            self.logger.info(
+                f"DucoBox system type {system_type}: "
+                f"temperatures={'yes' if self._supports_temps else 'no'}, "
+                f"filter={'yes' if self._supports_filter else 'no'}"
+            )
+        except Exception as e:
+            self.logger.error(f"Error detecting system capabilities: {e}")
+
     def _poll_system(self):
         """Poll DucoBox system data"""
         try:
@@ -137,41 +223,29 @@ class DucoPollingService:
                 self.logger.warning("No system info retrieved")
                 return
 
-            # Get temperatures (DucoBox Energy only)
-            temps = self.duco_client.get_temperatures()
-
-            # Get filter info
-            filter_remaining = self.duco_client.get_filter_remaining_time()
-            filter_status = self.duco_client.get_filter_status()
+            # Combine all reads into one dict (temperatures/filter: DucoBox Energy only)
+            readings = dict(system_info)
+            if self._supports_temps:
+                readings.update(self.duco_client.get_temperatures())
+            if self._supports_filter:
+                readings['filter_remaining_time'] = self.duco_client.get_filter_remaining_time()
+                readings['filter_status'] = self.duco_client.get_filter_status()
+
+            # Map readings onto DucoBoxSystem attributes in a single pass
+            payload = {}
+            for key, value in readings.items():
+                attr = self.DUCOBOX_FIELD_MAP.get(key)
+                if attr is not None and value is not None:
+                    payload[attr] = value
+            for attr in self.DUCOBOX_CODE_FIELDS:
+                if attr in payload:
+                    payload[attr] = payload[attr].value
 
             # Create DucoBoxSystem object
             ducobox = DucoBoxSystem(
                 device_id="ducobox_main",
                 node_type=NodeType.DUCOBOX,
-
-                # System status
-                status=system_info.get('ventilation_status').value if system_info.get('ventilation_status') else None,
-                ventilation_mode=system_info.get('ventilation_mode'),
-
-                # Air quality
-                humidity_level=system_info.get('humidity'),
-                co2_level=system_info.get('co2'),
-                air_quality_rh=system_info.get('air_quality_rh'),
-                air_quality_co2=system_info.get('air_quality_co2'),
-
-                # Filter
-                remaining_filter_time=filter_remaining,
-                filter_status=filter_status.value if filter_status else None,
-
-                # Temperatures
-                temperature_oda=temps.get('outdoor_air'),
-                temperature_sup=temps.get('supply_air'),
-                temperature_eta=temps.get('extract_air'),
-                temperature_eha=temps.get('exhaust_air'),
-
-                # System info
-                api_version=system_info.get('api_version'),
-                remaining_write_actions=system_info.get('remaining_write_actions')
+                **payload
             )
 
             # Publish to Redis
@@ -187,7 +261,7 @@ class DucoPollingService:
                 self.logger.error("Failed to publish DucoBox data")
 
         except Exception as e:
-            self.logger.error(f"Error polling system: {e}", exc_info=True)
+            self._log_err(e, "Error polling system")
             self.stats['errors'] += 1
 
     def _poll_nodes(self):
@@ -235,14 +309,14 @@ class DucoPollingService:
                 )
 
                 # Only publish if node has at least some data
-                has_data = any([
-                    node.remaining_time_current_mode is not None,
-                    node.flow_rate is not None,
-                    node.air_quality_rh is not None,
-                    node.air_quality_co2 is not None,
-                    node.humidity_level is not None,
+                has_data = (
+                    node.remaining_time_current_mode is not None or
+                    node.flow_rate is not None or
+                    node.air_quality_rh is not None or
+                    node.air_quality_co2 is not None or
+                    node.humidity_level is not None or
                     node.co2_level is not None
-                ])
+                )
 
                 if has_data:
                     nodes_to_publish.append(node)
@@ -254,7 +328,7 @@ class DucoPollingService:
                     self.logger.debug(f"Node {node_id} ({node_type.name}) has no data")
 
             except Exception as e:
-                self.logger.error(f"Error polling node {node_id}: {e}", exc_info=True)
+                self._log_err(e, "Error polling node %s", node_id)
                 self.stats['errors'] += 1
 
         # Publish all nodes in batch
@@ -308,6 +382,7 @@ class DucoPollingService:
     def identify_node(self, node_id: int, duration: float = 3.0) -> bool:
         """
         Identify a node by turning on its blue light.
+        Returns immediately; the light is switched off by a timer thread.
 
         Args:
             node_id: Node ID to identify
@@ -321,8 +396,9 @@ class DucoPollingService:
 
             if success:
                 self.logger.info(f"Identifying node {node_id} for {duration} seconds")
-                time.sleep(duration)
-                self.duco_client.identify_node(node_id, enable=False, force=True)
+                timer = threading.Timer(duration, self._end_identify_node, args=(node_id,))
+                timer.daemon = True
+                timer.start()
                 return True
             else:
                 self.logger.error(f"Failed to identify node {node_id}")
@@ -332,10 +408,22 @@ class DucoPollingService:
             self.logger.error(f"Error identifying node: {e}")
             return False
 
+    def _end_identify_node(self, node_id: int):
+        """Turn off node identification (runs on the identify timer thread)"""
+        try:
+            self.duco_client.identify_node(node_id, enable=False, force=True)
+        except Exception as e:
+            self.logger.error(f"Error ending identification of node {node_id}: {e}")
+
     def get_statistics(self) -> Dict[str, Any]:
         """Get service statistics"""
+        last_poll = None
+        if self._last_poll_ts is not None:
+            last_poll = datetime.fromtimestamp(self._last_poll_ts).isoformat()
+
         return {
             **self.stats,
+            'last_poll': last_poll,
             'running': self.running,
             'active_nodes': self.active_nodes,
             'poll_interval': self.poll_interval
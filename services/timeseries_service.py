@@ -2,24 +2,31 @@
 Time Series Storage Service - FIXED UNIQUE CONSTRAINT VERSION
 """
 
+import functools
+import itertools
 import logging
+import operator
+import struct
 import time
 import threading
-from typing import Optional, List, Dict, Any
-from datetime import datetime, timezone
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from dataclasses import dataclass
-import json
+from typing import Optional, List, Dict, Any, Iterator, NamedTuple, Sequence, Set, Tuple, Union
+from datetime import datetime, timedelta, timezone
 
 import psycopg2
+from psycopg2 import sql
+from psycopg2.pool import ThreadedConnectionPool
 from psycopg2.extras import execute_values
 from psycopg2 import Error as Psycopg2Error
 
 from core.publisher import UnifiedRedisPublisher
 
 
-@dataclass
-class MeasurementPoint:
-    """Single measurement point"""
+class MeasurementPoint(NamedTuple):
+    """Single measurement point; field order matches the INSERT columns, so it is its own row"""
     timestamp: datetime
     device_id: str
     device_type: str
@@ -27,7 +34,120 @@ class MeasurementPoint:
     measurement_type: str
     value: float
     unit: str
-    metadata: Optional[Dict[str, Any]] = None
+    source: str
+    device_name: Optional[str] = None
+    node_type: Optional[str] = None
+
+
+# execute_values row template, one placeholder per MeasurementPoint field
+_INSERT_TEMPLATE = "(" + ", ".join(["%s"] * len(MeasurementPoint._fields)) + ")"
+
+# Insert order matches the unique index (time, device_id, measurement_type),
+# so a flush walks chunks oldest to newest and index pages sequentially
+_INSERT_ORDER = operator.itemgetter(0, 1, 4)
+
+
+# PostgreSQL binary COPY framing
+_COPY_HEADER = b'PGCOPY\n\xff\r\n\x00' + struct.pack('>ii', 0, 0)  # signature, flags, extension length
+_COPY_TRAILER = struct.pack('>h', -1)
+_COPY_ROW_START = struct.Struct('>hiq')  # field count, then the 8-byte timestamptz field
+_COPY_FLOAT8 = struct.Struct('>id')  # length-prefixed float8
+_COPY_INT32 = struct.Struct('>i')
+_COPY_NULL = _COPY_INT32.pack(-1)
+_PG_EPOCH = datetime(2000, 1, 1, tzinfo=timezone.utc)
+
+
+# (Niko property, measurement_type, unit) stored for each Niko device
+_NIKO_FIELDS = (
+    ('AmbientTemperature', 'temperature', '°C'),
+    ('Humidity', 'humidity', '%'),
+    ('HeatIndex', 'heat_index', '°C'),
+)
+
+# (Redis field, measurement_type, unit) stored for the DucoBox system
+_DUCOBOX_FIELDS = (
+    ('humidity_level', 'humidity', '%'),
+    ('co2_level', 'co2', 'ppm'),
+    ('air_quality_rh', 'air_quality_rh', '%'),
+    ('air_quality_co2', 'air_quality_co2', '%'),
+    ('temperature_oda', 'outdoor_air_temp', '°C'),
+    ('temperature_sup', 'supply_air_temp', '°C'),
+    ('temperature_eta', 'extract_air_temp', '°C'),
+    ('temperature_eha', 'exhaust_air_temp', '°C'),
+    ('flow_rate', 'flow_rate', '%'),
+)
+
+# (Redis field, measurement_type, unit) stored for each DUCO node
+_DUCO_NODE_FIELDS = (
+    ('humidity_level', 'humidity', '%'),
+    ('co2_level', 'co2', 'ppm'),
+    ('flow_rate', 'flow_rate', '%'),
+)
+
+
+@functools.lru_cache(maxsize=256)
+def _duco_node_labels(node_id: Any, node_type: str) -> Tuple[str, str, str, str]:
+    """
+    (device_id, device_type, location, node_type) for a DUCO node. Cached, so
+    buffered points from every cycle share one set of label strings per node
+    instead of formatting new ones each collection.
+    """
+    return f"node_{node_id}", f"duco_{node_type}", f"Node {node_id}", node_type
+
+
+# Valid (min, max) per measurement_type; values outside are not stored
+_MEASUREMENT_RANGES = {
+    'temperature': (-50.0, 100.0),
+    'heat_index': (-50.0, 100.0),
+    'outdoor_air_temp': (-50.0, 100.0),
+    'supply_air_temp': (-50.0, 100.0),
+    'extract_air_temp': (-50.0, 100.0),
+    'exhaust_air_temp': (-50.0, 100.0),
+    'humidity': (0.0, 100.0),
+    'air_quality_rh': (0.0, 100.0),
+    'air_quality_co2': (0.0, 100.0),
+    'flow_rate': (0.0, 100.0),
+    'co2': (0.0, 5000.0),
+}
+_DEFAULT_RANGE = (-50.0, 5000.0)
+
+
+@functools.lru_cache(maxsize=512)
+def _parse_measurement_str(value: str) -> Optional[float]:
+    """
+    Parse a string measurement value, None if it is not a number. Cached:
+    sensor values arrive as the same few strings cycle after cycle.
+    """
+    value = value.strip()
+    if value == '':
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+
+class _ChunkReader:
+    """Minimal file-like reader over an iterator of bytes chunks, for copy_expert()"""
+
+    def __init__(self, chunks: Iterator[bytes]):
+        self._chunks = chunks
+        self._pending = bytearray()
+
+    def read(self, size: int = -1) -> bytes:
+        while size < 0 or len(self._pending) < size:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                break
+            self._pending += chunk
+
+        if size < 0 or size >= len(self._pending):
+            data = bytes(self._pending)
+            self._pending.clear()
+        else:
+            data = bytes(self._pending[:size])
+            del self._pending[:size]
+        return data
 
 
 class TimeSeriesDatabase:
@@ -50,14 +170,23 @@ class TimeSeriesDatabase:
         measurement_type TEXT NOT NULL,
         value DOUBLE PRECISION NOT NULL,
         unit TEXT NOT NULL,
-        metadata JSONB
+        source TEXT NOT NULL,
+        device_name TEXT,
+        node_type TEXT
     );
 
+    -- Tables created before the key columns replaced the metadata JSONB column
+    ALTER TABLE measurements ADD COLUMN IF NOT EXISTS source TEXT;
+    ALTER TABLE measurements ADD COLUMN IF NOT EXISTS device_name TEXT;
+    ALTER TABLE measurements ADD COLUMN IF NOT EXISTS node_type TEXT;
+
     -- Create hypertable (partitioned by time)
-    SELECT create_hypertable('measurements', 'time', 
-        chunk_time_interval => INTERVAL '1 day',
-        if_not_exists => TRUE
-    );
+    DO $$ BEGIN
+        PERFORM create_hypertable('measurements', 'time',
+            chunk_time_interval => INTERVAL '1 day',
+            if_not_exists => TRUE
+        );
+    END $$;
 
     -- Create unique index for ON CONFLICT clause
     -- Note: We create an index instead of constraint for hypertables
@@ -71,6 +200,12 @@ class TimeSeriesDatabase:
         ON measurements (measurement_type, time DESC);
     CREATE INDEX IF NOT EXISTS idx_measurements_location_time 
         ON measurements (location, time DESC);
+    CREATE INDEX IF NOT EXISTS idx_measurements_mt_dev_time
+        ON measurements (measurement_type, device_id, time DESC);
+
+    -- Compact block-range index for wide time-range scans (rows arrive time-ordered)
+    CREATE INDEX IF NOT EXISTS idx_measurements_time_brin
+        ON measurements USING BRIN (time) WITH (pages_per_range = 32);
 
     -- Continuous aggregate for hourly averages
     CREATE MATERIALIZED VIEW IF NOT EXISTS measurements_hourly
@@ -105,8 +240,103 @@ class TimeSeriesDatabase:
     FROM measurements
     GROUP BY bucket, device_id, device_type, location, measurement_type
     WITH NO DATA;
+
+    -- Real-time aggregation: queries union fresh raw rows with the materialized part
+    ALTER MATERIALIZED VIEW measurements_hourly SET (timescaledb.materialized_only = false);
+    ALTER MATERIALIZED VIEW measurements_daily SET (timescaledb.materialized_only = false);
+
+    -- Refresh policies (hourly rollups are at most ~20 minutes stale)
+    DO $$ BEGIN
+        PERFORM add_continuous_aggregate_policy('measurements_hourly',
+            start_offset => INTERVAL '3 hours',
+            end_offset => INTERVAL '10 minutes',
+            schedule_interval => INTERVAL '10 minutes',
+            if_not_exists => TRUE
+        );
+        PERFORM add_continuous_aggregate_policy('measurements_daily',
+            start_offset => INTERVAL '3 days',
+            end_offset => INTERVAL '1 hour',
+            schedule_interval => INTERVAL '1 hour',
+            if_not_exists => TRUE
+        );
+    END $$;
+    """
+
+    # Stored as the measurements table comment once SCHEMA_SQL has been applied;
+    # a matching comment lets startup skip the script until SCHEMA_SQL changes
+    SCHEMA_COMMENT = f"shome schema {zlib.crc32(SCHEMA_SQL.encode()):08x}"
+
+    # Batches at least this large are loaded with COPY instead of INSERT ... VALUES
+    COPY_THRESHOLD = 64
+
+    # Batches at least this large are split across insert_workers connections
+    PARALLEL_INSERT_THRESHOLD = 5000
+
+    # Pooled connections compress_chunks() leaves free besides the insert_workers
+    # ones, for queries, stats and aggregate refreshes. ThreadedConnectionPool
+    # raises PoolError instead of blocking when it runs dry
+    POOL_RESERVED_CONNECTIONS = 1
+
+    # Adaptive chunk sizing (chunk_time_interval='auto')
+    CHUNK_TARGET_BYTES = 256 * 1024 * 1024
+    CHUNK_MIN_HOURS = 1
+    CHUNK_MAX_HOURS = 7 * 24
+
+    # Compressed segments are keyed on the device/series identity. device_type and
+    # location follow from device_id, so listing them adds no segments; they are
+    # then stored once per segment instead of once per row, and location/type
+    # filters on compressed chunks are resolved from segment metadata.
+    # source/node_type stay per-row: node_type is NULL for most rows and would
+    # only fragment segments
+    COMPRESS_SEGMENTBY = ('device_id', 'measurement_type', 'device_type', 'location')
+
+    # Verify an idle ingest connection with SELECT 1 after this many seconds,
+    # so a server-side drop is caught before the insert retry path
+    CONNECTION_CHECK_INTERVAL = 30.0
+
+    # Rows per multi-row INSERT statement in the execute_values fallbacks
+    INSERT_PAGE_SIZE = 1000
+
+    # Bytes psycopg2 requests per read while streaming a COPY payload
+    COPY_READ_SIZE = 65536
+
+    # Column order shared by INSERT and COPY
+    INSERT_COLUMNS = (
+        "time, device_id, device_type, location, measurement_type, value, unit, "
+        "source, device_name, node_type"
+    )
+
+    # Columns query_measurements() can return (the legacy metadata column is not exposed)
+    MEASUREMENT_COLUMNS = (
+        'time', 'device_id', 'device_type', 'location', 'measurement_type', 'value', 'unit',
+        'source', 'device_name', 'node_type'
+    )
+
+    # Session-local COPY staging table, emptied on every commit
+    STAGING_TABLE_SQL = """
+        CREATE TEMP TABLE IF NOT EXISTS measurements_staging
+        (LIKE measurements INCLUDING DEFAULTS)
+        ON COMMIT DELETE ROWS
     """
 
+    # Ingest statements prepared on the server once per connection
+    PREPARED_STATEMENTS = {
+        # Small batches: one array per column
+        'ins_meas': f"""
+            PREPARE ins_meas (timestamptz[], text[], text[], text[], text[], float8[], text[], text[], text[], text[]) AS
+            INSERT INTO measurements ({INSERT_COLUMNS})
+            SELECT * FROM unnest($1, $2, $3, $4, $5, $6, $7, $8, $9, $10)
+            ON CONFLICT (time, device_id, measurement_type) DO NOTHING
+        """,
+        # COPY path: move the staged rows into the hypertable
+        'ins_staged': f"""
+            PREPARE ins_staged AS
+            INSERT INTO measurements ({INSERT_COLUMNS})
+            SELECT {INSERT_COLUMNS} FROM measurements_staging
+            ON CONFLICT (time, device_id, measurement_type) DO NOTHING
+        """,
+    }
+
     def __init__(
             self,
             host: str = 'localhost',
@@ -114,17 +344,27 @@ class TimeSeriesDatabase:
             database: str = 'smarthome',
             user: str = 'smarthome',
             password: str = '',
+            pool_minconn: int = 2,
+            pool_maxconn: int = 8,
+            insert_workers: int = 1,
             logger: Optional[logging.Logger] = None
     ):
         """
         Initialize TimescaleDB connection.
 
+        Inserts and schema management use one dedicated connection (self.conn);
+        queries borrow connections from a thread-safe pool so they do not
+        contend with the ingest transaction.
+
         Args:
             host: PostgreSQL host
             port: PostgreSQL port
             database: Database name
             user: Database user
             password: Database password
+            pool_minconn: Minimum pooled query connections
+            pool_maxconn: Maximum pooled query connections
+            insert_workers: Pooled connections that load large batches in parallel
             logger: Optional logger
         """
         self.connection_params = {
@@ -136,18 +376,45 @@ class TimeSeriesDatabase:
         }
         self.logger = logger or logging.getLogger(__name__)
         self.conn: Optional[psycopg2.extensions.connection] = None
+        self._cursor_counter = itertools.count()
+        self._staging_ready = False  # COPY staging table exists on this connection
+        self._prepared: Set[str] = set()  # PREPARED_STATEMENTS prepared on this connection
+        self._last_ok = 0.0  # time.monotonic() of the last confirmed round trip
+        self._query_cache: Dict[tuple, sql.Composed] = {}  # Composed query per filter shape
+
+        # Query connection pool (created lazily)
+        self.pool: Optional[ThreadedConnectionPool] = None
+        self.pool_minconn = pool_minconn
+        self.pool_maxconn = pool_maxconn
+        self.insert_workers = max(1, min(insert_workers, pool_maxconn))
 
     def connect(self) -> bool:
-        """Connect to TimescaleDB"""
+        """
+        Connect to TimescaleDB, replacing any existing ingest connection.
+        Also creates the query pool and validates one checkout, so pool
+        problems surface at startup rather than on the first query.
+        """
+        self.disconnect()
         try:
             self.conn = psycopg2.connect(**self.connection_params)
             self.conn.autocommit = False
+            self._staging_ready = False
+            self._prepared = set()
+            self._last_ok = time.monotonic()
             self.logger.info("Connected to TimescaleDB")
-            return True
         except Exception as e:
             self.logger.error(f"Failed to connect to TimescaleDB: {e}")
             return False
 
+        if self._ensure_pool():
+            try:
+                with self._pooled_connection() as conn, conn.cursor() as cur:
+                    cur.execute("SELECT 1")
+            except Exception as e:
+                self.logger.warning(f"TimescaleDB connection pool check failed: {e}")
+
+        return True
+
     def disconnect(self):
         """Disconnect from TimescaleDB"""
         if self.conn:
@@ -158,38 +425,124 @@ class TimeSeriesDatabase:
             finally:
                 self.conn = None
 
+    def _reconnect(self) -> bool:
+        """Drop the ingest connection and open a fresh one"""
+        self.logger.warning("Reconnecting to TimescaleDB")
+        return self.connect()
+
+    def _check_connection(self) -> bool:
+        """Round-trip SELECT 1 on the ingest connection, reconnecting on failure"""
+        if self.conn.get_transaction_status() != psycopg2.extensions.TRANSACTION_STATUS_IDLE:
+            # Mid-transaction; the rollback below would discard pending work
+            return True
+
+        try:
+            with self.conn.cursor() as cur:
+                cur.execute("SELECT 1")
+            self.conn.rollback()  # Do not leave the ping's transaction open
+            self._last_ok = time.monotonic()
+            return True
+        except (psycopg2.OperationalError, psycopg2.InterfaceError) as e:
+            self.logger.warning(f"TimescaleDB connection check failed: {e}")
+            return self._reconnect()
+
+    def close(self):
+        """Close the ingest connection and all pooled query connections"""
+        self.disconnect()
+        if self.pool is not None:
+            try:
+                self.pool.closeall()
+            except Exception:
+                pass
+            finally:
+                self.pool = None
+
+    def _ensure_pool(self) -> bool:
+        """Ensure the query connection pool exists"""
+        if self.pool is None or self.pool.closed:
+            try:
+                self.pool = ThreadedConnectionPool(
+                    self.pool_minconn, self.pool_maxconn, **self.connection_params
+                )
+            except Exception as e:
+                self.logger.error(f"Failed to create TimescaleDB connection pool: {e}")
+                self.pool = None
+                return False
+        return True
+
+    @contextmanager
+    def _pooled_connection(self):
+        """Borrow a pooled connection; the read transaction ends when it is returned"""
+        conn = self.pool.getconn()
+        broken = False
+        try:
+            yield conn
+            conn.commit()
+        except (psycopg2.OperationalError, psycopg2.InterfaceError):
+            broken = True  # Do not hand a dead connection out again
+            raise
+        except Exception:
+            if not conn.closed:
+                try:
+                    conn.rollback()
+                except Exception:
+                    pass
+            raise
+        finally:
+            self.pool.putconn(conn, close=broken or bool(conn.closed))
+
     def _ensure_connection(self) -> bool:
-        """Ensure we have a working connection"""
+        """Ensure we have a working connection, verifying it if idle for a while"""
         if not self.conn or self.conn.closed:
             return self.connect()
+        if time.monotonic() - self._last_ok > self.CONNECTION_CHECK_INTERVAL:
+            return self._check_connection()
         return True
 
-    def initialize_schema(self) -> bool:
-        """Initialize database schema with hypertables and policies"""
+    def initialize_schema(self, chunk_time_interval: Optional[str] = None) -> bool:
+        """
+        Initialize database schema with hypertables and policies.
+
+        Args:
+            chunk_time_interval: Optional PostgreSQL interval (e.g. '1 day') for
+                new measurements chunks; an invalid interval fails initialization.
+                'auto' sizes chunks from the measured ingest rate instead.
+        """
         if not self._ensure_connection():
             return False
 
+        schema_current = self._schema_is_current()
+
         try:
             with self.conn.cursor() as cur:
-                # First drop the unique index if it exists (to avoid conflicts)
-                try:
-                    cur.execute("DROP INDEX IF EXISTS measurements_unique_idx;")
-                except:
-                    pass
+                if not schema_current:
+                    # First drop the unique index if it exists (to avoid conflicts)
+                    try:
+                        cur.execute("DROP INDEX IF EXISTS measurements_unique_idx;")
+                    except:
+                        pass
 
-                # Execute schema creation
-                for statement in self.SCHEMA_SQL.split(';'):
-                    statement = statement.strip()
-                    if statement:
-                        try:
-                            cur.execute(statement)
-                        except Exception as e:
-                            # Some statements might fail if already exist, that's ok
-                            if "already exists" not in str(e).lower() and "duplicate" not in str(e).lower():
-                                self.logger.debug(f"Schema statement warning: {e}")
+                    # Execute schema creation in one round trip (all statements are idempotent)
+                    cur.execute(self.SCHEMA_SQL)
+                    cur.execute("COMMENT ON TABLE measurements IS %s", (self.SCHEMA_COMMENT,))
+
+                # Applies to chunks created from now on
+                if chunk_time_interval and chunk_time_interval != 'auto':
+                    cur.execute(
+                        "SELECT set_chunk_time_interval('measurements', %s::interval)",
+                        (chunk_time_interval,)
+                    )
 
                 self.conn.commit()
-                self.logger.info("Database schema initialized successfully")
+                if schema_current:
+                    self.logger.info("Database schema already up to date")
+                else:
+                    self.logger.info("Database schema initialized successfully")
+
+                if chunk_time_interval == 'auto':
+                    chunk_time_interval = self._adapt_chunk_interval()
+                if chunk_time_interval:
+                    self._check_chunk_size(chunk_time_interval)
 
                 # Set up compression and policies separately
                 self._setup_compression_and_policies()
@@ -201,57 +554,188 @@ class TimeSeriesDatabase:
             self._safe_rollback()
             return False
 
+    def _schema_is_current(self) -> bool:
+        """Check whether SCHEMA_SQL in its current form was already applied"""
+        try:
+            with self.conn.cursor() as cur:
+                cur.execute("SELECT obj_description(to_regclass('measurements'), 'pg_class')")
+                comment = cur.fetchone()[0]
+            self.conn.rollback()
+            return comment == self.SCHEMA_COMMENT
+        except Exception as e:
+            self.logger.debug(f"Could not read schema version: {e}")
+            self._safe_rollback()
+            return False
+
+    def _existing_policies(self) -> Set[str]:
+        """Names of the background policy jobs already scheduled on measurements"""
+        try:
+            with self.conn.cursor() as cur:
+                cur.execute("""
+                    SELECT proc_name FROM timescaledb_information.jobs
+                    WHERE hypertable_name = 'measurements'
+                """)
+                policies = {row[0] for row in cur.fetchall()}
+            self.conn.rollback()
+            return policies
+        except Exception as e:
+            self.logger.debug(f"Could not list policy jobs: {e}")
+            self._safe_rollback()
+            return set()
+
+    def _adapt_chunk_interval(self) -> Optional[str]:
+        """
+        Pick a chunk_time_interval that makes chunks about CHUNK_TARGET_BYTES,
+        from the median ingest rate of the last 7 complete, uncompressed chunks.
+
+        Returns:
+            The interval that was set, or None if there is no history yet
+        """
+        try:
+            with self.conn.cursor() as cur:
+                cur.execute("""
+                    SELECT percentile_cont(0.5) WITHIN GROUP (ORDER BY bytes_per_hour)
+                    FROM (
+                        SELECT d.total_bytes
+                            / NULLIF(EXTRACT(EPOCH FROM c.range_end - c.range_start) / 3600, 0) AS bytes_per_hour
+                        FROM timescaledb_information.chunks c
+                        JOIN chunks_detailed_size('measurements') d
+                            ON d.chunk_schema = c.chunk_schema AND d.chunk_name = c.chunk_name
+                        WHERE c.hypertable_name = 'measurements'
+                          AND c.range_end <= now()
+                          AND NOT c.is_compressed
+                        ORDER BY c.range_end DESC
+                        LIMIT 7
+                    ) recent
+                """)
+                row = cur.fetchone()
+                if row is None or not row[0]:
+                    self.conn.rollback()
+                    self.logger.info("No complete chunks yet; keeping the current chunk_time_interval")
+                    return None
+
+                hours = int(self.CHUNK_TARGET_BYTES / float(row[0]))
+                hours = max(self.CHUNK_MIN_HOURS, min(self.CHUNK_MAX_HOURS, hours))
+                chunk_time_interval = f"{hours} hours"
+
+                cur.execute(
+                    "SELECT set_chunk_time_interval('measurements', %s::interval)",
+                    (chunk_time_interval,)
+                )
+            self.conn.commit()
+            self.logger.info(
+                f"Adaptive chunk_time_interval set to {chunk_time_interval} "
+                f"(median ingest {float(row[0]) / (1024 * 1024):.2f} MB/hour)"
+            )
+            return chunk_time_interval
+
+        except Exception as e:
+            self.logger.warning(f"Could not adapt chunk_time_interval: {e}")
+            self._safe_rollback()
+            return None
+
+    def _check_chunk_size(self, chunk_time_interval: str):
+        """
+        Estimate the size of a chunk at the configured interval from the most
+        recent complete chunk, and warn when it exceeds 25% of shared_buffers
+        (the active chunk and its indexes should stay in memory for fast inserts).
+        """
+        try:
+            with self.conn.cursor() as cur:
+                cur.execute("""
+                    SELECT
+                        d.total_bytes * EXTRACT(EPOCH FROM %s::interval)
+                            / NULLIF(EXTRACT(EPOCH FROM c.range_end - c.range_start), 0),
+                        pg_size_bytes(current_setting('shared_buffers'))
+                    FROM timescaledb_information.chunks c
+                    JOIN chunks_detailed_size('measurements') d
+                        ON d.chunk_schema = c.chunk_schema AND d.chunk_name = c.chunk_name
+                    WHERE c.hypertable_name = 'measurements' AND c.range_end <= now()
+                    ORDER BY c.range_end DESC
+                    LIMIT 1
+                """, (chunk_time_interval,))
+                row = cur.fetchone()
+            self.conn.rollback()
+
+            if row is None or row[0] is None:
+                self.logger.info(f"Chunk time interval: {chunk_time_interval} (no complete chunk to size yet)")
+                return
+
+            estimated_mb = float(row[0]) / (1024 * 1024)
+            shared_buffers_mb = float(row[1]) / (1024 * 1024)
+            self.logger.info(
+                f"Chunk time interval: {chunk_time_interval} "
+                f"(estimated {estimated_mb:.1f} MB per chunk, shared_buffers {shared_buffers_mb:.0f} MB)"
+            )
+            if estimated_mb > 0.25 * shared_buffers_mb:
+                self.logger.warning(
+                    f"Estimated chunk size exceeds 25% of shared_buffers; "
+                    f"consider a shorter chunk_time_interval than {chunk_time_interval}"
+                )
+
+        except Exception as e:
+            self.logger.debug(f"Could not estimate chunk size: {e}")
+            self._safe_rollback()
+
     def _setup_compression_and_policies(self):
         """Set up compression and policies after schema is created"""
         if not self._ensure_connection():
             return
 
+        configure_compression = self._compression_needs_configuring()
+        policies = self._existing_policies()
+
         try:
             with self.conn.cursor() as cur:
-                # Enable compression on measurements table
-                try:
-                    cur.execute("""
-                        ALTER TABLE measurements SET (
-                            timescaledb.compress,
-                            timescaledb.compress_segmentby = 'device_id, measurement_type',
-                            timescaledb.compress_orderby = 'time DESC'
-                        );
-                    """)
-                    self.logger.info("Compression enabled on measurements table")
-                except Exception as e:
-                    self.logger.warning(f"Could not enable compression: {e}")
+                # Enable compression on measurements table.
+                # Ordered by time ASC so late/backfilled rows merge without re-sorting
+                # compressed segments; ORDER BY time DESC queries use a backward scan.
+                if configure_compression:
+                    try:
+                        cur.execute(f"""
+                            ALTER TABLE measurements SET (
+                                timescaledb.compress,
+                                timescaledb.compress_segmentby = '{', '.join(self.COMPRESS_SEGMENTBY)}',
+                                timescaledb.compress_orderby = 'time ASC'
+                            );
+                        """)
+                        self.logger.info("Compression enabled on measurements table")
+                    except Exception as e:
+                        self.logger.warning(f"Could not enable compression: {e}")
 
                 # Add compression policy (compress data older than 7 days)
-                try:
-                    cur.execute("""
-                        SELECT add_compression_policy('measurements', INTERVAL '7 days', if_not_exists => TRUE);
-                    """)
-                    self.logger.info("Compression policy added")
-                except Exception as e:
-                    self.logger.warning(f"Could not add compression policy: {e}")
-                    # Try older syntax
+                if 'policy_compression' not in policies:
                     try:
                         cur.execute("""
-                            SELECT add_compression_policy('measurements', INTERVAL '7 days');
+                            SELECT add_compression_policy('measurements', INTERVAL '7 days', if_not_exists => TRUE);
                         """)
-                    except:
-                        pass
+                        self.logger.info("Compression policy added")
+                    except Exception as e:
+                        self.logger.warning(f"Could not add compression policy: {e}")
+                        # Try older syntax
+                        try:
+                            cur.execute("""
+                                SELECT add_compression_policy('measurements', INTERVAL '7 days');
+                            """)
+                        except:
+                            pass
 
                 # Add retention policy (drop raw data older than 90 days)
-                try:
-                    cur.execute("""
-                        SELECT add_retention_policy('measurements', INTERVAL '90 days', if_not_exists => TRUE);
-                    """)
-                    self.logger.info("Retention policy added")
-                except Exception as e:
-                    self.logger.warning(f"Could not add retention policy: {e}")
-                    # Try older syntax
+                if 'policy_retention' not in policies:
                     try:
                         cur.execute("""
-                            SELECT add_retention_policy('measurements', INTERVAL '90 days');
+                            SELECT add_retention_policy('measurements', INTERVAL '90 days', if_not_exists => TRUE);
                         """)
-                    except:
-                        pass
+                        self.logger.info("Retention policy added")
+                    except Exception as e:
+                        self.logger.warning(f"Could not add retention policy: {e}")
+                        # Try older syntax
+                        try:
+                            cur.execute("""
+                                SELECT add_retention_policy('measurements', INTERVAL '90 days');
+                            """)
+                        except:
+                            pass
 
                 self.conn.commit()
                 self.logger.info("Compression and policies configured")
@@ -259,9 +743,90 @@ class TimeSeriesDatabase:
         except Exception as e:
             self.logger.error(f"Failed to setup compression/policies: {e}")
             self._safe_rollback()
+            return
+
+        self._create_compressed_segment_index()
+
+    def _create_compressed_segment_index(self):
+        """
+        Index the compressed hypertable on (measurement_type, device_id) so
+        segmentby lookups on compressed chunks use an index scan.
+        """
+        try:
+            with self.conn.cursor() as cur:
+                cur.execute("""
+                    SELECT c.schema_name, c.table_name
+                    FROM _timescaledb_catalog.hypertable h
+                    JOIN _timescaledb_catalog.hypertable c ON c.id = h.compressed_hypertable_id
+                    WHERE h.table_name = 'measurements'
+                """)
+                row = cur.fetchone()
+                if row is None:
+                    return  # Compression not enabled
+
+                cur.execute(
+                    sql.SQL("CREATE INDEX IF NOT EXISTS {} ON {}.{} (measurement_type, device_id)").format(
+                        sql.Identifier(f"{row[1]}_mt_dev_idx"),
+                        sql.Identifier(row[0]),
+                        sql.Identifier(row[1])
+                    )
+                )
+                self.conn.commit()
+                self.logger.info(f"Segmentby index ensured on {row[0]}.{row[1]}")
+
+        except Exception as e:
+            self.logger.warning(f"Could not create compressed segmentby index: {e}")
+            self._safe_rollback()
+
+    def _compression_needs_configuring(self) -> bool:
+        """
+        Check whether the compression settings must be (re)applied.
+
+        Tables still compressed with the old 'time DESC' order or with a
+        different COMPRESS_SEGMENTBY are migrated only while no chunk is
+        compressed yet; TimescaleDB refuses to change the settings once
+        compressed chunks exist.
+        """
+        try:
+            with self.conn.cursor() as cur:
+                cur.execute("""
+                    SELECT attname, segmentby_column_index, orderby_asc
+                    FROM timescaledb_information.compression_settings
+                    WHERE hypertable_name = 'measurements'
+                """)
+                rows = cur.fetchall()
+                if not rows:
+                    return True  # Compression not configured yet
+
+                segmentby = {attname for attname, seg_index, _ in rows if seg_index is not None}
+                time_asc = any(attname == 'time' and asc for attname, _, asc in rows)
+                if time_asc and segmentby == set(self.COMPRESS_SEGMENTBY):
+                    return False  # Already up to date
+
+                cur.execute("""
+                    SELECT COUNT(*) FROM timescaledb_information.chunks
+                    WHERE hypertable_name = 'measurements' AND is_compressed
+                """)
+                if cur.fetchone()[0] > 0:
+                    self.logger.warning(
+                        "Compressed chunks use outdated compression settings; "
+                        "leaving existing compression settings unchanged"
+                    )
+                    return False
+
+                self.logger.info("Migrating compression settings to the current segmentby/orderby")
+                return True
+
+        except Exception as e:
+            self.logger.debug(f"Could not read compression settings: {e}")
+            self._safe_rollback()
+            return True
 
     def _safe_rollback(self):
         """Safely rollback transaction and ensure clean state"""
+        # A rolled-back transaction may have created the staging table
+        self._staging_ready = False
+        self._prepared = set()
         if self.conn and not self.conn.closed:
             try:
                 self.conn.rollback()
@@ -281,9 +846,18 @@ class TimeSeriesDatabase:
             return False
 
         # Ensure timestamps are timezone aware
-        for m in measurements:
-            if m.timestamp.tzinfo is None:
-                m.timestamp = m.timestamp.replace(tzinfo=timezone.utc)
+        measurements = [
+            m if m.timestamp.tzinfo is not None
+            else m._replace(timestamp=m.timestamp.replace(tzinfo=timezone.utc))
+            for m in measurements
+        ]
+
+        # Time-ordered rows land in one chunk at a time and end in the active one;
+        # buffered batches are already nearly sorted, so this is close to linear
+        measurements.sort(key=_INSERT_ORDER)
+
+        if self.insert_workers > 1 and len(measurements) >= self.PARALLEL_INSERT_THRESHOLD:
+            return self._parallel_insert(measurements)
 
         retry_count = 0
         max_retries = 2
@@ -291,49 +865,33 @@ class TimeSeriesDatabase:
         while retry_count <= max_retries:
             try:
                 with self.conn.cursor() as cur:
-                    # Prepare data for bulk insert
-                    data = []
-                    for m in measurements:
-                        # Ensure metadata is JSON serializable
-                        metadata = m.metadata
-                        if metadata is not None:
-                            try:
-                                # Convert any non-serializable objects
-                                metadata = json.loads(json.dumps(metadata, default=str))
-                            except:
-                                metadata = {"raw": str(metadata)}
-
-                        data.append((
-                            m.timestamp,
-                            m.device_id,
-                            m.device_type,
-                            m.location,
-                            m.measurement_type,
-                            m.value,
-                            m.unit,
-                            json.dumps(metadata) if metadata else None
-                        ))
-
-                    # Bulk insert with ON CONFLICT DO NOTHING
-                    # Using the unique index we created
-                    execute_values(
-                        cur,
-                        """
-                        INSERT INTO measurements 
-                        (time, device_id, device_type, location, measurement_type, value, unit, metadata)
-                        VALUES %s
-                        ON CONFLICT (time, device_id, measurement_type) DO NOTHING
-                        """,
-                        data,
-                        template="(%s, %s, %s, %s, %s, %s, %s, %s)"
-                    )
+                    if len(measurements) >= self.COPY_THRESHOLD:
+                        # Large batches: stream through COPY into a staging table
+                        inserted_count = self._copy_insert(cur, measurements)
+                        self.conn.commit()
+                        self._last_ok = time.monotonic()
+                        self.logger.debug(f"Inserted {inserted_count} measurements via COPY (skipped {len(measurements) - inserted_count} duplicates)")
+                        return True
+
+                    # Transpose rows into one array per column (zip runs in C) and
+                    # insert them with a single EXECUTE of the prepared unnest INSERT
+                    columns = [list(column) for column in zip(*measurements)]
+                    self._ensure_prepared(cur, 'ins_meas')
+                    cur.execute("EXECUTE ins_meas (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)", columns)
 
                     self.conn.commit()
-                    inserted_count = cur.rowcount
-                    if inserted_count > 0:
-                        self.logger.debug(f"Inserted {inserted_count} measurements (skipped {len(measurements) - inserted_count} duplicates)")
+                    self._last_ok = time.monotonic()
+                    self.logger.debug(f"Inserted batch of {len(measurements)} measurements (duplicates skipped)")
                     return True
 
+            except (psycopg2.OperationalError, psycopg2.InterfaceError) as e:
+                # Connection dropped; reconnect and retry straight away
+                self.logger.error(f"Lost TimescaleDB connection during insert (attempt {retry_count + 1}): {e}")
+                retry_count += 1
+                if retry_count > max_retries or not self._reconnect():
+                    return False
+                continue
+
             except (Psycopg2Error, Exception) as e:
                 error_msg = str(e).lower()
                 self.logger.error(f"Failed to insert measurements (attempt {retry_count + 1}): {e}")
@@ -376,61 +934,181 @@ class TimeSeriesDatabase:
 
         return False
 
+    def _ensure_prepared(self, cur, name: str):
+        """Prepare one of PREPARED_STATEMENTS once per connection"""
+        if name in self._prepared:
+            return
+
+        # Prepared statements outlive rolled-back transactions, so check first
+        cur.execute("SELECT 1 FROM pg_prepared_statements WHERE name = %s", (name,))
+        if cur.fetchone() is None:
+            cur.execute(self.PREPARED_STATEMENTS[name])
+        self._prepared.add(name)
+
+    @staticmethod
+    def _copy_binary(measurements: Sequence[MeasurementPoint]) -> Iterator[bytes]:
+        """
+        Encode measurements in PostgreSQL binary COPY format: timestamptz as
+        microseconds since 2000-01-01 UTC, float8 big-endian, text as UTF-8.
+        Rows are produced lazily, one bytes object per row (plus header and
+        trailer). Text fields repeat across rows, so their encodings are cached.
+        """
+        encoded: Dict[Optional[str], bytes] = {None: _COPY_NULL}
+
+        def text(value: Optional[str]) -> bytes:
+            field = encoded.get(value)
+            if field is None:
+                raw = value.encode('utf-8')
+                field = encoded[value] = _COPY_INT32.pack(len(raw)) + raw
+            return field
+
+        row_start = _COPY_ROW_START.pack
+        float8 = _COPY_FLOAT8.pack
+        field_count = len(MeasurementPoint._fields)
+
+        yield _COPY_HEADER
+        for m in measurements:
+            delta = m.timestamp - _PG_EPOCH
+            yield b''.join((
+                row_start(
+                    field_count, 8,
+                    (delta.days * 86400 + delta.seconds) * 1000000 + delta.microseconds
+                ),
+                text(m.device_id),
+                text(m.device_type),
+                text(m.location),
+                text(m.measurement_type),
+                float8(8, float(m.value)),
+                text(m.unit),
+                text(m.source),
+                text(m.device_name),
+                text(m.node_type)
+            ))
+        yield _COPY_TRAILER
+
+    def _copy_to_staging(self, cur, measurements: Sequence[MeasurementPoint]):
+        """COPY measurements into the session's staging table"""
+        # The payload is encoded while psycopg2 reads it, so memory stays bounded
+        cur.copy_expert(
+            f"COPY measurements_staging ({self.INSERT_COLUMNS}) FROM STDIN WITH (FORMAT binary)",
+            _ChunkReader(self._copy_binary(measurements)),
+            size=self.COPY_READ_SIZE
+        )
+
+    def _parallel_insert(self, measurements: List[MeasurementPoint]) -> bool:
+        """
+        Split a large batch into insert_workers shards by device_id and COPY
+        each shard on its own pooled connection concurrently. A device always
+        maps to the same shard, so shards never contend for the same index keys.
+        Each shard commits on its own; a retry after partial failure is safe
+        because duplicates are skipped with ON CONFLICT DO NOTHING.
+        """
+        if not self._ensure_pool():
+            return False
+
+        shards: List[List[MeasurementPoint]] = [[] for _ in range(self.insert_workers)]
+        for m in measurements:
+            shards[hash(m.device_id) % self.insert_workers].append(m)
+        shards = [shard for shard in shards if shard]
+
+        try:
+            with ThreadPoolExecutor(max_workers=len(shards), thread_name_prefix='insert') as executor:
+                inserted_count = sum(executor.map(self._copy_insert_pooled, shards))
+        except Exception as e:
+            self.logger.error(f"Parallel insert failed: {e}")
+            return False
+
+        self.logger.debug(
+            f"Inserted {inserted_count} measurements via {len(shards)} parallel COPYs "
+            f"(skipped {len(measurements) - inserted_count} duplicates)"
+        )
+        return True
+
+    def _copy_insert_pooled(self, measurements: List[MeasurementPoint]) -> int:
+        """COPY one shard through a pooled connection; returns rows inserted"""
+        with self._pooled_connection() as conn, conn.cursor() as cur:
+            cur.execute(self.STAGING_TABLE_SQL)
+            self._copy_to_staging(cur, measurements)
+            cur.execute(f"""
+                INSERT INTO measurements ({self.INSERT_COLUMNS})
+                SELECT {self.INSERT_COLUMNS} FROM measurements_staging
+                ON CONFLICT (time, device_id, measurement_type) DO NOTHING
+            """)
+            return cur.rowcount
+
+    def _copy_insert(self, cur, measurements: List[MeasurementPoint]) -> int:
+        """
+        Load measurements with binary COPY into a temporary staging table, then
+        move them into the hypertable with ON CONFLICT DO NOTHING.
+
+        Returns:
+            Number of rows inserted (duplicates excluded)
+        """
+        # Session-local staging table, emptied on every commit; created once per connection
+        if not self._staging_ready:
+            cur.execute(self.STAGING_TABLE_SQL)
+            self._staging_ready = True
+
+        self._copy_to_staging(cur, measurements)
+
+        # One set-based move into the hypertable for the whole flush
+        self._ensure_prepared(cur, 'ins_staged')
+        cur.execute("EXECUTE ins_staged")
+        return cur.rowcount
+
     def _insert_measurements_without_conflict(self, measurements: List[MeasurementPoint]) -> bool:
-        """Insert measurements without ON CONFLICT clause - handle duplicates manually"""
+        """Insert measurements without ON CONFLICT clause - skip duplicates by bisecting the batch"""
         if not self._ensure_connection():
             return False
 
         try:
             with self.conn.cursor() as cur:
-                inserted_count = 0
-
-                for m in measurements:
-                    # Prepare metadata
-                    metadata = m.metadata
-                    if metadata is not None:
-                        try:
-                            metadata = json.loads(json.dumps(metadata, default=str))
-                        except:
-                            metadata = {"raw": str(metadata)}
-
-                    try:
-                        cur.execute("""
-                            INSERT INTO measurements 
-                            (time, device_id, device_type, location, measurement_type, value, unit, metadata)
-                            VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
-                        """, (
-                            m.timestamp,
-                            m.device_id,
-                            m.device_type,
-                            m.location,
-                            m.measurement_type,
-                            m.value,
-                            m.unit,
-                            json.dumps(metadata) if metadata else None
-                        ))
-                        inserted_count += 1
-                    except psycopg2.errors.UniqueViolation:
-                        # Duplicate entry, skip it
-                        self.conn.rollback()
-                        # Start a new transaction for the next insert
-                        continue
-                    except Exception as e:
-                        self.logger.debug(f"Failed to insert single measurement: {e}")
-                        self.conn.rollback()
-                        continue
-                    else:
-                        self.conn.commit()
+                inserted_count = self._insert_bisect(cur, measurements)
+                self.conn.commit()
 
                 if inserted_count > 0:
-                    self.logger.debug(f"Inserted {inserted_count} measurements individually")
+                    self.logger.debug(f"Inserted {inserted_count} measurements (duplicates bisected out)")
                 return True
 
         except Exception as e:
-            self.logger.error(f"Failed in individual insert: {e}")
+            self.logger.error(f"Failed in bisecting insert: {e}")
             self._safe_rollback()
             return False
 
+    def _insert_bisect(self, cur, measurements: Sequence[MeasurementPoint]) -> int:
+        """
+        Insert a slice as one multi-row INSERT inside a savepoint. If a row is
+        rejected, roll back to the savepoint and retry both halves, so only the
+        offending rows end up being tried on their own.
+
+        Returns:
+            Number of rows inserted
+        """
+        cur.execute("SAVEPOINT bisect")
+        try:
+            execute_values(
+                cur,
+                f"INSERT INTO measurements ({self.INSERT_COLUMNS}) VALUES %s",
+                measurements,
+                template=_INSERT_TEMPLATE,
+                page_size=self.INSERT_PAGE_SIZE
+            )
+        except (psycopg2.OperationalError, psycopg2.InterfaceError):
+            raise  # Connection problems are not row problems
+        except Psycopg2Error as e:
+            cur.execute("ROLLBACK TO SAVEPOINT bisect")
+            cur.execute("RELEASE SAVEPOINT bisect")
+            if len(measurements) == 1:
+                if not isinstance(e, psycopg2.errors.UniqueViolation):
+                    self.logger.debug(f"Failed to insert single measurement: {e}")
+                return 0
+
+            mid = len(measurements) // 2
+            return self._insert_bisect(cur, measurements[:mid]) + self._insert_bisect(cur, measurements[mid:])
+
+        cur.execute("RELEASE SAVEPOINT bisect")
+        return len(measurements)
+
     def _insert_measurements_simple(self, measurements: List[MeasurementPoint]) -> bool:
         """Simple insert without ON CONFLICT - last resort"""
         if not self._ensure_connection():
@@ -438,39 +1116,20 @@ class TimeSeriesDatabase:
 
         try:
             with self.conn.cursor() as cur:
-                # Prepare data for bulk insert
-                data = []
-                for m in measurements:
-                    # Ensure metadata is JSON serializable
-                    metadata = m.metadata
-                    if metadata is not None:
-                        try:
-                            # Convert any non-serializable objects
-                            metadata = json.loads(json.dumps(metadata, default=str))
-                        except:
-                            metadata = {"raw": str(metadata)}
-
-                    data.append((
-                        m.timestamp,
-                        m.device_id,
-                        m.device_type,
-                        m.location,
-                        m.measurement_type,
-                        m.value,
-                        m.unit,
-                        json.dumps(metadata) if metadata else None
-                    ))
+                # MeasurementPoints are already parameter tuples in column order
+                data = measurements
 
                 # Bulk insert WITHOUT ON CONFLICT
                 execute_values(
                     cur,
-                    """
-                    INSERT INTO measurements 
-                    (time, device_id, device_type, location, measurement_type, value, unit, metadata)
+                    f"""
+                    INSERT INTO measurements
+                    ({self.INSERT_COLUMNS})
                     VALUES %s
                     """,
                     data,
-                    template="(%s, %s, %s, %s, %s, %s, %s, %s)"
+                    template=_INSERT_TEMPLATE,
+                    page_size=self.INSERT_PAGE_SIZE
                 )
 
                 self.conn.commit()
@@ -485,103 +1144,344 @@ class TimeSeriesDatabase:
 
     def query_measurements(
             self,
-            device_id: Optional[str] = None,
-            measurement_type: Optional[str] = None,
-            location: Optional[str] = None,
+            device_id: Optional[Union[str, Sequence[str]]] = None,
+            measurement_type: Optional[Union[str, Sequence[str]]] = None,
+            location: Optional[Union[str, Sequence[str]]] = None,
+            start_time: Optional[datetime] = None,
+            end_time: Optional[datetime] = None,
+            limit: int = 1000,
+            stream: bool = False,
+            batch_size: int = 2000,
+            columns: Optional[Sequence[str]] = None
+    ) -> Union[List[Dict[str, Any]], Iterator[Dict[str, Any]]]:
+        """
+        Query measurements with filters.
+
+        Only the requested columns (default: MEASUREMENT_COLUMNS) are
+        selected; pass e.g. ('time', 'value') to fetch just what a chart needs.
+        Names are checked against MEASUREMENT_COLUMNS.
+
+        device_id, measurement_type and location accept a single value or a
+        sequence of values; sequences are bound as one array parameter
+        (= ANY(%s)) so multiple series are fetched in a single query.
+
+        With stream=True rows are fetched through a server-side cursor in
+        batches of batch_size and yielded one at a time instead of returned
+        as a list, which bounds memory for large limits.
+        """
+        columns = tuple(columns) if columns else self.MEASUREMENT_COLUMNS
+        unknown = [column for column in columns if column not in self.MEASUREMENT_COLUMNS]
+        if unknown:
+            self.logger.error(f"Unknown measurement columns: {unknown}")
+            return iter(()) if stream else []
+
+        if not self._ensure_pool():
+            return iter(()) if stream else []
+
+        try:
+            query, params = self._filtered_query(
+                'measurements', columns, 'time',
+                device_id, measurement_type, location, start_time, end_time, limit
+            )
+
+            if stream:
+                return self._stream_query(query, params, columns, batch_size)
+
+            # A pooled connection may have gone stale; retry once on a fresh one
+            for attempt in range(2):
+                try:
+                    with self._pooled_connection() as conn:
+                        with conn.cursor() as cur:
+                            cur.execute(query, params)
+                            return [dict(zip(columns, row)) for row in cur.fetchall()]
+                except (psycopg2.OperationalError, psycopg2.InterfaceError) as e:
+                    if attempt:
+                        raise
+                    self.logger.warning(f"Query connection lost, retrying: {e}")
+
+        except Exception as e:
+            self.logger.error(f"Failed to query measurements: {e}", exc_info=True)
+            return []
+
+    # Continuous aggregate view for each query_aggregates() resolution
+    AGGREGATE_VIEWS = {
+        'hour': 'measurements_hourly',
+        'day': 'measurements_daily',
+    }
+
+    # Columns of the continuous aggregate views
+    AGGREGATE_COLUMNS = (
+        'bucket', 'device_id', 'device_type', 'location', 'measurement_type',
+        'avg_value', 'min_value', 'max_value', 'sample_count'
+    )
+
+    def query_aggregates(
+            self,
+            resolution: str = 'hour',
+            device_id: Optional[Union[str, Sequence[str]]] = None,
+            measurement_type: Optional[Union[str, Sequence[str]]] = None,
+            location: Optional[Union[str, Sequence[str]]] = None,
             start_time: Optional[datetime] = None,
             end_time: Optional[datetime] = None,
             limit: int = 1000
     ) -> List[Dict[str, Any]]:
-        """Query measurements with filters"""
-        if not self._ensure_connection():
+        """
+        Query pre-aggregated avg/min/max/count buckets from the continuous aggregates.
+
+        Reads one row per bucket instead of scanning the raw hypertable; the
+        views use real-time aggregation, so the newest bucket is included.
+        Filters behave as in query_measurements() and apply to the bucket start.
+
+        Args:
+            resolution: 'hour' or 'day'
+
+        Returns:
+            Rows with bucket, device_id, device_type, location, measurement_type,
+            avg_value, min_value, max_value and sample_count, newest first
+        """
+        view = self.AGGREGATE_VIEWS.get(resolution)
+        if view is None:
+            self.logger.error(f"Unknown aggregate resolution: {resolution}")
+            return []
+
+        if not self._ensure_pool():
             return []
 
         try:
-            # Build query dynamically
-            query_parts = ["SELECT * FROM measurements WHERE 1=1"]
-            params = []
+            columns = self.AGGREGATE_COLUMNS
+            query, params = self._filtered_query(
+                view, columns, 'bucket',
+                device_id, measurement_type, location, start_time, end_time, limit
+            )
 
-            if device_id:
-                query_parts.append("AND device_id = %s")
-                params.append(device_id)
+            with self._pooled_connection() as conn, conn.cursor() as cur:
+                cur.execute(query, params)
+                return [dict(zip(columns, row)) for row in cur.fetchall()]
 
-            if measurement_type:
-                query_parts.append("AND measurement_type = %s")
-                params.append(measurement_type)
+        except Exception as e:
+            self.logger.error(f"Failed to query aggregates: {e}")
+            return []
 
-            if location:
-                query_parts.append("AND location = %s")
-                params.append(location)
+    def _filtered_query(
+            self,
+            table: str,
+            columns: Tuple[str, ...],
+            time_column: str,
+            device_id, measurement_type, location,
+            start_time: Optional[datetime],
+            end_time: Optional[datetime],
+            limit: int
+    ) -> Tuple[sql.Composed, List[Any]]:
+        """
+        Build the filtered, newest-first query shared by the measurement
+        queries. The statement depends only on which filters are set and
+        whether they are single values or lists, so it is composed once per
+        shape and then served from _query_cache; only the parameters are
+        rebuilt per call.
+
+        Returns:
+            Query and its parameters
+        """
+        shape: List[Any] = [table, columns, time_column]
+        params: List[Any] = []
+        for value in (device_id, measurement_type, location):
+            if not value:
+                shape.append(None)
+            elif isinstance(value, str):
+                shape.append('=')
+                params.append(value)
+            else:
+                shape.append('any')
+                params.append(list(value))
+        for value in (start_time, end_time):
+            shape.append(bool(value))
+            if value:
+                params.append(value)
+        params.append(limit)
+
+        key = tuple(shape)
+        query = self._query_cache.get(key)
+        if query is None:
+            query = self._query_cache[key] = self._compose_query(key)
+        return query, params
+
+    @staticmethod
+    def _compose_query(shape: tuple) -> sql.Composed:
+        """Compose the query for a _filtered_query() shape"""
+        table, columns, time_column, *filters, has_start, has_end = shape
+        time_id = sql.Identifier(time_column)
+
+        conditions = []
+        for column, kind in zip(('device_id', 'measurement_type', 'location'), filters):
+            if kind == '=':
+                conditions.append(sql.SQL("{} = %s").format(sql.Identifier(column)))
+            elif kind == 'any':
+                conditions.append(sql.SQL("{} = ANY(%s)").format(sql.Identifier(column)))
+        if has_start:
+            conditions.append(sql.SQL("{} >= %s").format(time_id))
+        if has_end:
+            conditions.append(sql.SQL("{} <= %s").format(time_id))
+
+        query = sql.SQL("SELECT {} FROM {}").format(
+            sql.SQL(', ').join(map(sql.Identifier, columns)),
+            sql.Identifier(table)
+        )
+        if conditions:
+            query += sql.SQL(" WHERE ") + sql.SQL(" AND ").join(conditions)
+        query += sql.SQL(" ORDER BY {} DESC LIMIT %s").format(time_id)
+        return query
 
-            if start_time:
-                query_parts.append("AND time >= %s")
-                params.append(start_time)
+    def _stream_query(
+            self,
+            query: sql.Composed,
+            params: List[Any],
+            columns: Tuple[str, ...],
+            batch_size: int
+    ) -> Iterator[Dict[str, Any]]:
+        """Yield query rows as dicts from a named (server-side) cursor"""
+        cursor_name = f"qm_{id(self)}_{next(self._cursor_counter)}"
+        try:
+            # The pooled connection is held until the generator is exhausted or closed
+            with self._pooled_connection() as conn:
+                with conn.cursor(name=cursor_name) as cur:
+                    cur.itersize = batch_size
+                    cur.execute(query, params)
+                    for row in cur:
+                        yield dict(zip(columns, row))
+        except Exception as e:
+            self.logger.error(f"Failed to stream measurements: {e}")
 
-            if end_time:
-                query_parts.append("AND time <= %s")
-                params.append(end_time)
+    def compress_chunks(self, workers: int = 1, older_than: str = '7 days') -> int:
+        """
+        Compress uncompressed chunks older than older_than, spreading them over
+        up to `workers` pooled connections. Each chunk is handed to exactly one
+        worker, so workers never wait on each other's chunk locks.
 
-            query_parts.append("ORDER BY time DESC LIMIT %s")
-            params.append(limit)
+        Each worker holds its connection for a whole compress_chunk call, so
+        workers are capped at pool_maxconn - insert_workers -
+        POOL_RESERVED_CONNECTIONS (at least 1) to leave room for live inserts
+        and queries.
 
-            query = " ".join(query_parts)
+        Args:
+            workers: Number of parallel compression workers (capped as above)
+            older_than: PostgreSQL interval; only chunks ending before now() - older_than
 
-            with self.conn.cursor() as cur:
-                cur.execute(query, params)
-                columns = [desc[0] for desc in cur.description]
-                results = [dict(zip(columns, row)) for row in cur.fetchall()]
-                return results
+        Returns:
+            Number of chunks compressed
+        """
+        if not self._ensure_pool():
+            return 0
 
+        try:
+            with self._pooled_connection() as conn, conn.cursor() as cur:
+                cur.execute("""
+                    SELECT format('%%I.%%I', chunk_schema, chunk_name)
+                    FROM timescaledb_information.chunks
+                    WHERE hypertable_name = 'measurements'
+                      AND NOT is_compressed
+                      AND range_end <= now() - %s::interval
+                    ORDER BY range_end
+                """, (older_than,))
+                chunks = [row[0] for row in cur.fetchall()]
         except Exception as e:
-            self.logger.error(f"Failed to query measurements: {e}", exc_info=True)
-            return []
+            self.logger.error(f"Failed to list chunks for compression: {e}")
+            return 0
+
+        if not chunks:
+            return 0
+
+        # One pooled connection per worker, leaving the insert and query connections free
+        available = self.pool_maxconn - self.insert_workers - self.POOL_RESERVED_CONNECTIONS
+        workers = max(1, min(workers, available, len(chunks)))
+        self.logger.info(f"Compressing {len(chunks)} chunks with {workers} workers")
+
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='compress') as executor:
+            compressed = sum(executor.map(self._compress_chunk, chunks))
+
+        self.logger.info(f"Compressed {compressed}/{len(chunks)} chunks")
+        return compressed
+
+    def _compress_chunk(self, chunk: str) -> bool:
+        """Compress a single chunk on its own pooled connection"""
+        try:
+            with self._pooled_connection() as conn, conn.cursor() as cur:
+                cur.execute("SELECT compress_chunk(%s::regclass, if_not_compressed => TRUE)", (chunk,))
+            return True
+        except Exception as e:
+            self.logger.warning(f"Could not compress chunk {chunk}: {e}")
+            return False
+
+    def refresh_continuous_aggregates(self, hours_back: int = 2) -> int:
+        """
+        Refresh the hourly aggregate for the last `hours_back` complete hours,
+        one bucket per call. Each refresh commits on its own, so locks on the
+        materialization are held only briefly and buckets without invalidated
+        rows are skipped by TimescaleDB. The still-open hour is served by
+        real-time aggregation.
+
+        Args:
+            hours_back: Number of complete hours to refresh
+
+        Returns:
+            Number of hourly buckets refreshed
+        """
+        if not self._ensure_pool():
+            return 0
+
+        end = datetime.now(timezone.utc).replace(minute=0, second=0, microsecond=0)
+        windows = [(end - timedelta(hours=h + 1), end - timedelta(hours=h)) for h in reversed(range(hours_back))]
+
+        refreshed = 0
+        try:
+            with self._pooled_connection() as conn:
+                # refresh_continuous_aggregate() cannot run inside a transaction block
+                conn.autocommit = True
+                try:
+                    with conn.cursor() as cur:
+                        for start, stop in windows:
+                            cur.execute(
+                                "CALL refresh_continuous_aggregate('measurements_hourly', %s, %s)",
+                                (start, stop)
+                            )
+                            refreshed += 1
+                finally:
+                    conn.autocommit = False
+        except Exception as e:
+            self.logger.warning(f"Could not refresh continuous aggregates: {e}")
+
+        return refreshed
+
+    COMPRESSION_STATS_SQL = """
+        PREPARE comp_stats AS
+        SELECT
+            pg_size_pretty(before_compression_total_bytes) as before_compression,
+            pg_size_pretty(after_compression_total_bytes) as after_compression,
+            ROUND(100 - (after_compression_total_bytes::numeric /
+                  NULLIF(before_compression_total_bytes, 0)::numeric * 100), 2) as compression_ratio
+        FROM hypertable_compression_stats('measurements')
+    """
 
     def get_compression_stats(self) -> Dict[str, Any]:
         """Get compression statistics"""
-        if not self._ensure_connection():
+        if not self._ensure_pool():
             return {}
 
         try:
-            with self.conn.cursor() as cur:
-                # Try different queries for different TimescaleDB versions
-                queries = [
-                    """
-                    SELECT 
-                        cs.uncompressed_heap_size as before_compression,
-                        cs.compressed_heap_size as after_compression,
-                        ROUND(100 - (cs.compressed_heap_size::numeric / 
-                              NULLIF(cs.uncompressed_heap_size::numeric, 0) * 100), 2) as compression_ratio
-                    FROM timescaledb_information.compressed_chunk_stats cs
-                    JOIN timescaledb_information.hypertables h 
-                        ON cs.hypertable_name = h.hypertable_name
-                    WHERE h.hypertable_name = 'measurements'
-                    LIMIT 1;
-                    """,
-                    """
-                    SELECT 
-                        pg_size_pretty(uncompressed_total_bytes) as before_compression,
-                        pg_size_pretty(compressed_total_bytes) as after_compression,
-                        ROUND(100 - (compressed_total_bytes::numeric / 
-                              NULLIF(uncompressed_total_bytes::numeric, 0) * 100), 2) as compression_ratio
-                    FROM timescaledb_information.compressed_chunk_stats
-                    WHERE hypertable_name = 'measurements'
-                    LIMIT 1;
-                    """
-                ]
-
-                for query in queries:
-                    try:
-                        cur.execute(query)
-                        result = cur.fetchone()
-                        if result:
-                            return {
-                                'before_compression': result[0],
-                                'after_compression': result[1],
-                                'compression_ratio_percent': result[2]
-                            }
-                    except Exception as e:
-                        self.logger.debug(f"Compression stats query failed: {e}")
-                        continue
+            with self._pooled_connection() as conn, conn.cursor() as cur:
+                # Prepared once per pooled session; PREPARE survives rollbacks
+                try:
+                    cur.execute("EXECUTE comp_stats")
+                except psycopg2.errors.InvalidSqlStatementName:
+                    conn.rollback()
+                    cur.execute(self.COMPRESSION_STATS_SQL)
+                    cur.execute("EXECUTE comp_stats")
+                result = cur.fetchone()
+                if result and result[0] is not None:
+                    return {
+                        'before_compression': result[0],
+                        'after_compression': result[1],
+                        'compression_ratio_percent': result[2]
+                    }
 
                 return {}
 
@@ -596,11 +1496,16 @@ class TimeSeriesCollector:
     Runs as a background service.
     """
 
+    # Minimum seconds between collection error logs that include a traceback
+    ERROR_TRACEBACK_INTERVAL = 60.0
+
     def __init__(
             self,
             redis_publisher: UnifiedRedisPublisher,
             timeseries_db: TimeSeriesDatabase,
             collection_interval: int = 60,  # seconds
+            flush_threshold: int = 1000,  # measurements
+            flush_interval: int = 300,  # seconds
             logger: Optional[logging.Logger] = None
     ):
         """
@@ -610,15 +1515,34 @@ class TimeSeriesCollector:
             redis_publisher: Redis publisher to read from
             timeseries_db: TimescaleDB instance to write to
             collection_interval: How often to collect data (seconds)
+            flush_threshold: Flush buffered measurements once this many are collected
+            flush_interval: Flush buffered measurements at least this often (seconds)
             logger: Optional logger
         """
         self.redis_publisher = redis_publisher
         self.timeseries_db = timeseries_db
         self.collection_interval = collection_interval
+        self.flush_threshold = flush_threshold
+        self.flush_interval = flush_interval
         self.logger = logger or logging.getLogger(__name__)
 
         self.running = False
         self.thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+
+        # Measurements collected but not yet written to the database
+        self._buffer: List[MeasurementPoint] = []
+        self._buffer_lock = threading.Lock()
+        self._max_buffer_size = flush_threshold * 10  # Bound memory while the DB is down
+        self._last_flush = time.monotonic()
+
+        # Inserts run here, so the next collection does not wait for the database
+        self._flush_executor: Optional[ThreadPoolExecutor] = None
+        self._flush_future = None
+        self._closed = False  # Set by stop(); no new background flushes after that
+
+        # time.monotonic() of the last collection error logged with a traceback
+        self._last_traceback: Optional[float] = None
 
         # Statistics
         self.stats = {
@@ -635,6 +1559,9 @@ class TimeSeriesCollector:
             return
 
         self.running = True
+        self._stop_event.clear()
+        self._closed = False
+        self._flush_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='ts-flush')
         self.thread = threading.Thread(target=self._run_loop, daemon=True)
         self.thread.start()
         self.logger.info(f"Time series collector started (interval: {self.collection_interval}s)")
@@ -645,67 +1572,166 @@ class TimeSeriesCollector:
             return
 
         self.running = False
+        self._stop_event.set()
         if self.thread:
             self.thread.join(timeout=5)
+            if self.thread.is_alive():
+                self.logger.warning("Collection thread did not stop in time; rows it still collects are not flushed")
+
+        # From here on only stop() writes to the database: a collection that is
+        # still running keeps its rows buffered instead of starting a flush
+        with self._buffer_lock:
+            self._closed = True
+
+        # Let a running flush finish, then write out whatever is still buffered
+        if self._flush_executor:
+            self._flush_executor.shutdown(wait=True)
+            self._flush_executor = None
+        self._maybe_flush(force=True)
         self.logger.info("Time series collector stopped")
 
     def _run_loop(self):
         """Main collection loop"""
+        # Collections run on a fixed monotonic schedule, so the time a cycle
+        # takes does not push later samples back
+        next_run = time.monotonic()
         while self.running:
             try:
-                self._collect_and_store()
+                # One timestamp per cycle keeps all points of a sample aligned
+                timestamp = datetime.now(timezone.utc)
+                self._collect_and_store(timestamp)
                 self.stats['collections'] += 1
-                self.stats['last_collection'] = datetime.now(timezone.utc).isoformat()
+                self.stats['last_collection'] = timestamp
 
             except Exception as e:
-                self.logger.error(f"Error in collection loop: {e}", exc_info=True)
+                self._log_error("Error in collection loop", e)
                 self.stats['errors'] += 1
 
-            # Wait for next collection
-            for _ in range(self.collection_interval):
-                if not self.running:
-                    break
-                time.sleep(1)
+            # Wait for next collection (stop() sets the event for quick shutdown);
+            # ticks missed while a cycle overran are skipped, not made up
+            now = time.monotonic()
+            next_run += self.collection_interval
+            while next_run <= now:
+                next_run += self.collection_interval
+            if self._stop_event.wait(next_run - now):
+                break
+
+    def _collect_and_store(self, timestamp: Optional[datetime] = None):
+        """Collect data from Redis and buffer it for TimescaleDB"""
+        if timestamp is None:
+            timestamp = datetime.now(timezone.utc)
 
-    def _collect_and_store(self):
-        """Collect data from Redis and store in TimescaleDB"""
         measurements = []
 
         try:
             # Collect Niko temperature/humidity sensors
-            niko_measurements = self._collect_niko_measurements()
+            niko_measurements = self._collect_niko_measurements(timestamp)
             measurements.extend(niko_measurements)
 
             # Collect Duco system data
-            duco_measurements = self._collect_duco_measurements()
+            duco_measurements = self._collect_duco_measurements(timestamp)
             measurements.extend(duco_measurements)
 
             # Store all measurements
             if measurements:
-                # Ensure all timestamps are timezone aware
-                current_time = datetime.now(timezone.utc)
-                for m in measurements:
-                    if m.timestamp.tzinfo is None:
-                        m.timestamp = current_time
-
-                success = self.timeseries_db.insert_measurements(measurements)
-                if success:
-                    self.stats['measurements_stored'] += len(measurements)
-                    self.logger.debug(f"Collected {len(measurements)} measurements")
-                else:
-                    self.logger.error("Failed to store measurements")
-                    self.stats['errors'] += 1
+                # Every point carries the cycle's aware timestamp, so no tz fixup is needed
+                # Keep the buffer in insert order; the flush-time sort is then a single pass
+                measurements.sort(key=_INSERT_ORDER)
+
+                with self._buffer_lock:
+                    self._buffer.extend(measurements)
+                self.logger.debug(f"Collected {len(measurements)} measurements")
             else:
                 self.logger.debug("No measurements to store")
 
         except Exception as e:
-            self.logger.error(f"Error collecting data: {e}", exc_info=True)
+            self._log_error("Error collecting data", e)
             self.stats['errors'] += 1
 
-    def _collect_niko_measurements(self) -> List[MeasurementPoint]:
+        self._maybe_flush()
+
+    def _maybe_flush(self, force: bool = False):
+        """
+        Write buffered measurements to TimescaleDB when the buffer reaches
+        flush_threshold, flush_interval has passed, or force is set.
+        The insert runs on the flush thread, overlapping the next collection;
+        force (used on stop) inserts inline. While a flush is still running,
+        new rows stay buffered for the following one.
+        """
+        with self._buffer_lock:
+            if not self._buffer:
+                return
+
+            if not force and self._closed:
+                return
+
+            if not force and self._flush_future is not None and not self._flush_future.done():
+                return
+
+            due = (
+                force or
+                len(self._buffer) >= self.flush_threshold or
+                time.monotonic() - self._last_flush >= self.flush_interval
+            )
+            if not due:
+                return
+
+            batch = self._buffer
+            self._buffer = []
+            self._last_flush = time.monotonic()
+
+            future = None
+            executor = None if force else self._flush_executor
+            if executor is not None:
+                try:
+                    future = self._flush_future = executor.submit(self._flush, batch)
+                except RuntimeError as e:
+                    # Executor already shut down; keep the rows for the final flush
+                    self.logger.warning(f"Could not schedule flush: {e}")
+                    self._buffer = (batch + self._buffer)[-self._max_buffer_size:]
+                    return
+
+        if future is not None:
+            # Added outside the buffer lock: a finished future runs the callback at once
+            future.add_done_callback(lambda f: self._on_flush_done(f, batch))
+            return
+
+        self._flush(batch)
+
+    def _on_flush_done(self, future, batch: List[MeasurementPoint]):
+        """Count and log a flush that raised instead of returning, and keep its rows"""
+        error = future.exception()
+        if error is None:
+            return
+
+        self.logger.error(f"Unexpected error flushing measurements: {error}", exc_info=error)
+        self.stats['errors'] += 1
+        with self._buffer_lock:
+            self._buffer = (batch + self._buffer)[-self._max_buffer_size:]
+
+    def _flush(self, batch: List[MeasurementPoint]):
+        """Insert one batch; on failure the rows go back to the buffer (up to _max_buffer_size)"""
+        # insert_measurements() re-validates an idle connection before writing
+        success = self.timeseries_db.insert_measurements(batch)
+
+        if success:
+            self.stats['measurements_stored'] += len(batch)
+            self.logger.debug(f"Flushed {len(batch)} measurements")
+            return
+
+        self.logger.error("Failed to store measurements")
+        self.stats['errors'] += 1
+        with self._buffer_lock:
+            # Keep the newest rows for the next attempt
+            self._buffer = (batch + self._buffer)[-self._max_buffer_size:]
+
+    def _collect_niko_measurements(self, timestamp: datetime) -> List[MeasurementPoint]:
         """Collect measurements from Niko devices"""
         measurements = []
-        timestamp = datetime.now(timezone.utc)
+        # Bound once; these run for every field of every device
+        measurement_value = self._measurement_value
+        append = measurements.append
+        make = MeasurementPoint._make
 
         try:
             # Get all Niko devices
@@ -715,245 +1741,118 @@ class TimeSeriesCollector:
                 device_id = device.get('uuid', '')
                 device_type = device.get('device_type', '')
                 location = device.get('location_name', 'Unknown')
-                properties = device.get('properties', {})
-
-                # Extract temperature
-                if 'AmbientTemperature' in properties:
-                    temp = properties['AmbientTemperature']
-                    if self._is_valid_measurement(temp):
-                        measurements.append(MeasurementPoint(
-                            timestamp=timestamp,
-                            device_id=device_id,
-                            device_type=device_type,
-                            location=location,
-                            measurement_type='temperature',
-                            value=float(temp),
-                            unit='°C',
-                            metadata={'source': 'niko', 'name': device.get('name')}
-                        ))
-
-                # Extract humidity
-                if 'Humidity' in properties:
-                    humidity = properties['Humidity']
-                    if self._is_valid_measurement(humidity):
-                        measurements.append(MeasurementPoint(
-                            timestamp=timestamp,
-                            device_id=device_id,
-                            device_type=device_type,
-                            location=location,
-                            measurement_type='humidity',
-                            value=float(humidity),
-                            unit='%',
-                            metadata={'source': 'niko', 'name': device.get('name')}
-                        ))
-
-                # Extract heat index if available
-                if 'HeatIndex' in properties:
-                    heat_index = properties['HeatIndex']
-                    if self._is_valid_measurement(heat_index):
-                        measurements.append(MeasurementPoint(
-                            timestamp=timestamp,
-                            device_id=device_id,
-                            device_type=device_type,
-                            location=location,
-                            measurement_type='heat_index',
-                            value=float(heat_index),
-                            unit='°C',
-                            metadata={'source': 'niko', 'name': device.get('name')}
-                        ))
+                get = device.get('properties', {}).get
+                # Fields shared by every point of this device
+                head = (timestamp, device_id, device_type, location)
+                tail = ('niko', device.get('name'), None)
+
+                for key, measurement_type, unit in _NIKO_FIELDS:
+                    value = measurement_value(get(key), measurement_type)
+                    if value is not None:
+                        append(make((*head, measurement_type, value, unit, *tail)))
 
         except Exception as e:
-            self.logger.error(f"Error collecting Niko measurements: {e}", exc_info=True)
+            self._log_error("Error collecting Niko measurements", e)
 
         return measurements
 
-    def _collect_duco_measurements(self) -> List[MeasurementPoint]:
+    def _collect_duco_measurements(self, timestamp: datetime) -> List[MeasurementPoint]:
         """Collect measurements from Duco system"""
         measurements = []
-        timestamp = datetime.now(timezone.utc)
+        # Bound once; these run for every field of every device
+        measurement_value = self._measurement_value
+        append = measurements.append
+        make = MeasurementPoint._make
 
         try:
-            # Get DucoBox system data
-            ducobox = self.redis_publisher.get_ducobox()
+            # DucoBox system data and all nodes in one Redis round trip
+            ducobox, nodes = self.redis_publisher.get_duco_snapshot()
             if ducobox:
                 device_id = 'ducobox_main'
                 location = 'Ventilation System'
 
-                # System humidity
-                if self._is_valid_measurement(ducobox.get('humidity_level')):
-                    measurements.append(MeasurementPoint(
-                        timestamp=timestamp,
-                        device_id=device_id,
-                        device_type='ducobox',
-                        location=location,
-                        measurement_type='humidity',
-                        value=float(ducobox['humidity_level']),
-                        unit='%',
-                        metadata={'source': 'duco'}
-                    ))
-
-                # System CO2
-                if self._is_valid_measurement(ducobox.get('co2_level')):
-                    measurements.append(MeasurementPoint(
-                        timestamp=timestamp,
-                        device_id=device_id,
-                        device_type='ducobox',
-                        location=location,
-                        measurement_type='co2',
-                        value=float(ducobox['co2_level']),
-                        unit='ppm',
-                        metadata={'source': 'duco'}
-                    ))
-
-                # Air quality metrics
-                if self._is_valid_measurement(ducobox.get('air_quality_rh')):
-                    measurements.append(MeasurementPoint(
-                        timestamp=timestamp,
-                        device_id=device_id,
-                        device_type='ducobox',
-                        location=location,
-                        measurement_type='air_quality_rh',
-                        value=float(ducobox['air_quality_rh']),
-                        unit='%',
-                        metadata={'source': 'duco'}
-                    ))
-
-                if self._is_valid_measurement(ducobox.get('air_quality_co2')):
-                    measurements.append(MeasurementPoint(
-                        timestamp=timestamp,
-                        device_id=device_id,
-                        device_type='ducobox',
-                        location=location,
-                        measurement_type='air_quality_co2',
-                        value=float(ducobox['air_quality_co2']),
-                        unit='%',
-                        metadata={'source': 'duco'}
-                    ))
-
-                # Temperatures (DucoBox Energy)
-                temp_fields = {
-                    'temperature_oda': 'outdoor_air_temp',
-                    'temperature_sup': 'supply_air_temp',
-                    'temperature_eta': 'extract_air_temp',
-                    'temperature_eha': 'exhaust_air_temp'
-                }
-
-                for field, measurement_type in temp_fields.items():
-                    value = ducobox.get(field)
-                    if self._is_valid_measurement(value):
-                        measurements.append(MeasurementPoint(
-                            timestamp=timestamp,
-                            device_id=device_id,
-                            device_type='ducobox',
-                            location=location,
-                            measurement_type=measurement_type,
-                            value=float(value),
-                            unit='°C',
-                            metadata={'source': 'duco'}
-                        ))
-
-                # Flow rate (derived from ventilation mode)
-                if self._is_valid_measurement(ducobox.get('flow_rate')):
-                    measurements.append(MeasurementPoint(
-                        timestamp=timestamp,
-                        device_id=device_id,
-                        device_type='ducobox',
-                        location=location,
-                        measurement_type='flow_rate',
-                        value=float(ducobox['flow_rate']),
-                        unit='%',
-                        metadata={'source': 'duco'}
-                    ))
-
-            # Get Duco node data
-            nodes = self.redis_publisher.get_all_duco_nodes()
+                get = ducobox.get
+                head = (timestamp, device_id, 'ducobox', location)
+                tail = ('duco', None, None)
+                for key, measurement_type, unit in _DUCOBOX_FIELDS:
+                    value = measurement_value(get(key), measurement_type)
+                    if value is not None:
+                        append(make((*head, measurement_type, value, unit, *tail)))
+
+            # Duco node data
             for node in nodes:
-                node_id = f"node_{node.get('node_id')}"
-                node_type = node.get('node_type_name', 'unknown')
-                location = f"Node {node.get('node_id')}"
-
-                # Node humidity
-                if self._is_valid_measurement(node.get('humidity_level')):
-                    measurements.append(MeasurementPoint(
-                        timestamp=timestamp,
-                        device_id=node_id,
-                        device_type=f'duco_{node_type}',
-                        location=location,
-                        measurement_type='humidity',
-                        value=float(node['humidity_level']),
-                        unit='%',
-                        metadata={'source': 'duco', 'node_type': node_type}
-                    ))
-
-                # Node CO2
-                if self._is_valid_measurement(node.get('co2_level')):
-                    measurements.append(MeasurementPoint(
-                        timestamp=timestamp,
-                        device_id=node_id,
-                        device_type=f'duco_{node_type}',
-                        location=location,
-                        measurement_type='co2',
-                        value=float(node['co2_level']),
-                        unit='ppm',
-                        metadata={'source': 'duco', 'node_type': node_type}
-                    ))
-
-                # Node flow rate
-                if self._is_valid_measurement(node.get('flow_rate')):
-                    measurements.append(MeasurementPoint(
-                        timestamp=timestamp,
-                        device_id=node_id,
-                        device_type=f'duco_{node_type}',
-                        location=location,
-                        measurement_type='flow_rate',
-                        value=float(node['flow_rate']),
-                        unit='%',
-                        metadata={'source': 'duco', 'node_type': node_type}
-                    ))
+                get = node.get
+                node_id, device_type, location, node_type = _duco_node_labels(
+                    get('node_id'), get('node_type_name', 'unknown')
+                )
 
-        except Exception as e:
-            self.logger.error(f"Error collecting Duco measurements: {e}", exc_info=True)
+                head = (timestamp, node_id, device_type, location)
+                tail = ('duco', None, node_type)
 
-        return measurements
+                for key, measurement_type, unit in _DUCO_NODE_FIELDS:
+                    value = measurement_value(get(key), measurement_type)
+                    if value is not None:
+                        append(make((*head, measurement_type, value, unit, *tail)))
 
-    def _is_valid_measurement(self, value) -> bool:
-        """Check if a measurement value is valid for storage"""
-        if value is None:
-            return False
+        except Exception as e:
+            self._log_error("Error collecting Duco measurements", e)
 
-        try:
-            # Check if it's a string that can be converted to float
-            if isinstance(value, str):
-                value = value.strip()
-                if value == '':
-                    return False
-                # Try to convert to check if it's valid
-                float(value)
+        return measurements
 
-            # Check for reasonable ranges (adjust as needed)
-            num_value = float(value) if not isinstance(value, (int, float)) else value
+    @staticmethod
+    def _measurement_value(value, measurement_type: str) -> Optional[float]:
+        """
+        Validate and convert a raw measurement value in one step, checking it
+        against the range of its measurement_type (_MEASUREMENT_RANGES).
 
-            # Example: temperature between -50 and 100°C
-            if -50 <= num_value <= 100:
-                return True
-            # Humidity between 0 and 100%
-            if 0 <= num_value <= 100:
-                return True
-            # CO2 between 0 and 5000 ppm
-            if 0 <= num_value <= 5000:
-                return True
+        Returns:
+            The value as a float, or None if it is not valid for storage
+        """
+        # Numbers (the usual case) are range-checked directly; only other types
+        # pay for a float() that may raise
+        if type(value) is float:
+            num_value = value
+        elif type(value) is int:
+            num_value = float(value)
+        elif value is None:
+            return None
+        elif type(value) is str:
+            num_value = _parse_measurement_str(value)
+            if num_value is None:
+                return None
+        else:
+            try:
+                num_value = float(value)
+            except (ValueError, TypeError):
+                return None
 
-            return False
+        low, high = _MEASUREMENT_RANGES.get(measurement_type, _DEFAULT_RANGE)
+        if low <= num_value <= high:
+            return num_value
+        return None
 
-        except (ValueError, TypeError):
-            return False
+    def _log_error(self, message: str, error: Exception):
+        """
+        Log a collection error. The traceback is included at most once per
+        ERROR_TRACEBACK_INTERVAL, so an outage that fails every cycle does not
+        format a full traceback each time.
+        """
+        now = time.monotonic()
+        if self._last_traceback is None or now - self._last_traceback >= self.ERROR_TRACEBACK_INTERVAL:
+            self._last_traceback = now
+            self.logger.error("%s: %s", message, error, exc_info=error)
+        else:
+            self.logger.error("%s: %r", message, error)
 
     def get_statistics(self) -> Dict[str, Any]:
         """Get collector statistics"""
+        last_collection = self.stats['last_collection']
         return {
             **self.stats,
+            'last_collection': last_collection.isoformat() if last_collection else None,
             'running': self.running,
-            'collection_interval': self.collection_interval
+            'collection_interval': self.collection_interval,
+            'buffered_measurements': len(self._buffer)
         }
 
 
@@ -961,45 +1860,88 @@ class TimeSeriesCollector:
 # Standalone Execution
 # ============================================================================
 
+@dataclass(frozen=True, slots=True)
+class ServiceConfig:
+    """Standalone service configuration, read from the environment once"""
+    db_host: str = 'localhost'
+    db_port: int = 5432
+    db_name: str = 'smarthome'
+    db_user: str = 'smarthome'
+    db_password: str = ''
+    redis_host: str = 'localhost'
+    redis_port: int = 6379
+    key_prefix: str = 'smarthome'
+    collection_interval: int = 60
+    chunk_time_interval: str = '1 day'
+    # Parallel chunk compression at startup (0 = off). Shares the query pool
+    # (pool_maxconn=8) with inserts: capped at 8 - insert_workers - 1, at least 1
+    compression_workers: int = 0
+    insert_workers: int = 1
+
+    @classmethod
+    def from_env(cls) -> 'ServiceConfig':
+        """Load .env and build the configuration from environment variables"""
+        import os
+        from dotenv import load_dotenv
+
+        load_dotenv()
+
+        return cls(
+            db_host=os.getenv('TIMESCALE_HOST', 'localhost'),
+            db_port=int(os.getenv('TIMESCALE_PORT', 5432)),
+            db_name=os.getenv('TIMESCALE_DB', 'smarthome'),
+            db_user=os.getenv('TIMESCALE_USER', 'smarthome'),
+            db_password=os.getenv('TIMESCALE_PASSWORD', ''),
+            redis_host=os.getenv('REDIS_HOST', 'localhost'),
+            redis_port=int(os.getenv('REDIS_PORT', 6379)),
+            key_prefix=os.getenv('REDIS_KEY_PREFIX', 'smarthome'),
+            collection_interval=int(os.getenv('COLLECTION_INTERVAL', 60)),
+            chunk_time_interval=os.getenv('TS_CHUNK_INTERVAL', '1 day'),
+            compression_workers=int(os.getenv('COMPRESSION_WORKERS', 0)),
+            insert_workers=int(os.getenv('INSERT_WORKERS', 1))
+        )
+
+
 def main():
     """Main entry point for standalone execution"""
-    import os
-    from dotenv import load_dotenv
+    import logging.handlers
+    import queue
+    import signal
+    import sys
 
-    load_dotenv()
+    # Get configuration
+    config = ServiceConfig.from_env()
 
-    # Setup logging
+    # Setup logging: service threads only enqueue records, a listener thread writes them
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(
+        logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    )
+    log_queue = queue.Queue(-1)
+    log_listener = logging.handlers.QueueListener(log_queue, stream_handler)
     logging.basicConfig(
         level=logging.INFO,
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+        handlers=[logging.handlers.QueueHandler(log_queue)]
     )
+    # Record fields the format never uses
+    logging.logThreads = False
+    logging.logProcesses = False
+    logging.logMultiprocessing = False
+    log_listener.start()
 
     logger = logging.getLogger(__name__)
-
-    # Get configuration
-    db_host = os.getenv('TIMESCALE_HOST', 'localhost')
-    db_port = int(os.getenv('TIMESCALE_PORT', 5432))
-    db_name = os.getenv('TIMESCALE_DB', 'smarthome')
-    db_user = os.getenv('TIMESCALE_USER', 'smarthome')
-    db_password = os.getenv('TIMESCALE_PASSWORD', '')
-
-    redis_host = os.getenv('REDIS_HOST', 'localhost')
-    redis_port = int(os.getenv('REDIS_PORT', 6379))
-    key_prefix = os.getenv('REDIS_KEY_PREFIX', 'smarthome')
-
-    collection_interval = int(os.getenv('COLLECTION_INTERVAL', 60))
-
     logger.info("Starting Time Series Storage Service...")
 
     try:
         # Initialize TimescaleDB
-        logger.info(f"Connecting to TimescaleDB at {db_host}:{db_port}...")
+        logger.info(f"Connecting to TimescaleDB at {config.db_host}:{config.db_port}...")
         timeseries_db = TimeSeriesDatabase(
-            host=db_host,
-            port=db_port,
-            database=db_name,
-            user=db_user,
-            password=db_password,
+            host=config.db_host,
+            port=config.db_port,
+            database=config.db_name,
+            user=config.db_user,
+            password=config.db_password,
+            insert_workers=config.insert_workers,
             logger=logger
         )
 
@@ -1011,18 +1953,26 @@ def main():
 
         # Initialize schema
         logger.info("Initializing database schema...")
-        if timeseries_db.initialize_schema():
+        if timeseries_db.initialize_schema(chunk_time_interval=config.chunk_time_interval):
             logger.info("✓ Schema initialized")
         else:
             logger.error("Failed to initialize schema")
             return
 
+        # Work through the compression backlog in parallel, next to the policy job
+        if config.compression_workers > 0:
+            threading.Thread(
+                target=timeseries_db.compress_chunks,
+                kwargs={'workers': config.compression_workers},
+                daemon=True
+            ).start()
+
         # Initialize Redis publisher
-        logger.info(f"Connecting to Redis at {redis_host}:{redis_port}...")
+        logger.info(f"Connecting to Redis at {config.redis_host}:{config.redis_port}...")
         redis_publisher = UnifiedRedisPublisher(
-            redis_host=redis_host,
-            redis_port=redis_port,
-            key_prefix=key_prefix
+            redis_host=config.redis_host,
+            redis_port=config.redis_port,
+            key_prefix=config.key_prefix
         )
         logger.info("✓ Connected to Redis")
 
@@ -1030,57 +1980,92 @@ def main():
         collector = TimeSeriesCollector(
             redis_publisher=redis_publisher,
             timeseries_db=timeseries_db,
-            collection_interval=collection_interval,
+            collection_interval=config.collection_interval,
             logger=logger
         )
 
         # Start collector
         collector.start()
 
+        # Shut down cleanly on Ctrl+C and SIGTERM; wakes the stats loop immediately
+        stop_event = threading.Event()
+
+        def signal_handler(signum, frame):
+            logger.info(f"Received signal {signum}, shutting down...")
+            stop_event.set()
+
+        signal.signal(signal.SIGINT, signal_handler)
+        signal.signal(signal.SIGTERM, signal_handler)
+
         print("\n" + "=" * 60)
         print("TIME SERIES STORAGE SERVICE")
         print("=" * 60)
-        print(f"\nCollection interval: {collection_interval} seconds")
+        print(f"\nCollection interval: {config.collection_interval} seconds")
         print("Data compression: Enabled (7 days)")
         print("Retention: 90 days (raw data)")
         print("\nPress Ctrl+C to stop.\n")
 
-        # Main loop - print stats
-        while True:
-            time.sleep(60)
-
+        # Compression stats only change when the compression job runs; poll them less often
+        compression_stats_interval = 600  # seconds
+        aggregate_refresh_interval = 900  # seconds
+        last_aggregate_refresh = time.monotonic()
+        compression_stats: Dict[str, Any] = {}
+        last_compression_poll: Optional[float] = None
+
+        # Main loop - print stats until a shutdown signal arrives, on a fixed
+        # 60s schedule that the time spent reporting does not shift
+        next_report = time.monotonic() + 60
+        while not stop_event.wait(max(0.0, next_report - time.monotonic())):
+            next_report += 60
             stats = collector.get_statistics()
-            compression_stats = timeseries_db.get_compression_stats()
-
-            print("\n" + "-" * 60)
-            print("SERVICE STATISTICS")
-            print("-" * 60)
-            print(f"Collections: {stats['collections']}")
-            print(f"Measurements stored: {stats['measurements_stored']}")
-            print(f"Errors: {stats['errors']}")
+
+            if last_compression_poll is None or \
+                    time.monotonic() - last_compression_poll >= compression_stats_interval:
+                compression_stats = timeseries_db.get_compression_stats()
+                last_compression_poll = time.monotonic()
+
+            # Bring recent hourly rollups up to date between policy runs
+            if time.monotonic() - last_aggregate_refresh >= aggregate_refresh_interval:
+                timeseries_db.refresh_continuous_aggregates()
+                last_aggregate_refresh = time.monotonic()
+
+            # Build the report first and emit it with a single write
+            lines = [
+                "",
+                "-" * 60,
+                "SERVICE STATISTICS",
+                "-" * 60,
+                f"Collections: {stats['collections']}",
+                f"Measurements stored: {stats['measurements_stored']}",
+                f"Errors: {stats['errors']}",
+            ]
             if stats['last_collection']:
-                print(f"Last collection: {stats['last_collection']}")
+                lines.append(f"Last collection: {stats['last_collection']}")
 
+            lines.append("\nCOMPRESSION STATISTICS")
             if compression_stats:
-                print("\nCOMPRESSION STATISTICS")
-                print(f"Before compression: {compression_stats.get('before_compression', 'N/A')}")
-                print(f"After compression: {compression_stats.get('after_compression', 'N/A')}")
-                print(f"Compression ratio: {compression_stats.get('compression_ratio_percent', 'N/A')}%")
+                lines.append(f"Before compression: {compression_stats.get('before_compression', 'N/A')}")
+                lines.append(f"After compression: {compression_stats.get('after_compression', 'N/A')}")
+                lines.append(f"Compression ratio: {compression_stats.get('compression_ratio_percent', 'N/A')}%")
             else:
-                print("\nCOMPRESSION STATISTICS")
-                print("No compression data available yet (data may not be old enough)")
+                lines.append("No compression data available yet (data may not be old enough)")
 
-            print("-" * 60 + "\n")
+            lines.append("-" * 60 + "\n\n")
+            sys.stdout.write("\n".join(lines))
+            sys.stdout.flush()
 
-    except KeyboardInterrupt:
         print("\n\nStopping service...")
         collector.stop()
-        timeseries_db.disconnect()
+        timeseries_db.close()
         print("Service stopped.")
 
     except Exception as e:
         logger.error(f"Fatal error: {e}", exc_info=True)
 
+    finally:
+        # Drain queued log records before exiting
+        log_listener.stop()
+
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
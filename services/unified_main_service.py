@@ -4,12 +4,14 @@ Manages both Niko Home Control (event-driven) and Duco ventilation (polling)
 """
 import logging
 import os
+from collections import defaultdict
 import signal
 import sys
+import threading
 import time
 from datetime import datetime
 from pathlib import Path
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Tuple
 
 sys.path.insert(0, str(Path(__file__).parent))
 
@@ -33,6 +35,8 @@ class NikoCallbackService:
             self,
             niko_api: NikoHomeControlAPI,
             redis_publisher: UnifiedRedisPublisher,
+            publish_delay: float = 0.02,
+            max_batch: int = 100,
             logger: Optional[logging.Logger] = None
     ):
         """
@@ -41,6 +45,9 @@ class NikoCallbackService:
         Args:
             niko_api: Authenticated NikoHomeControlAPI instance
             redis_publisher: UnifiedRedisPublisher instance
+            publish_delay: Seconds to collect device updates before publishing
+                them to Redis in one pipeline (bursts such as scenes)
+            max_batch: Publish immediately once this many devices are pending
             logger: Optional logger
         """
         self.niko_api = niko_api
@@ -50,9 +57,22 @@ class NikoCallbackService:
         self.devices_cache: Dict[str, NikoBaseDevice] = {}
         self.locations_cache: Dict[str, Location] = {}
 
+        # Device updates waiting to be published, latest state per UUID
+        self.publish_delay = publish_delay
+        self.max_batch = max_batch
+        self._pending: Dict[str, Tuple[NikoBaseDevice, str]] = {}
+        self._pending_lock = threading.Lock()
+        self._flush_timer: Optional[threading.Timer] = None
+        # Held from taking a batch until it is written, so a removal waits for an
+        # in-flight publish and its DEL always lands after that batch's SET
+        self._flush_lock = threading.Lock()
+        # Last state successfully written to Redis per UUID; re-sends matching it are skipped
+        self._published: Dict[str, NikoBaseDevice] = {}
+
         # Statistics
         self.stats = {
             'device_updates': 0,
+            'skipped_updates': 0,
             'location_updates': 0,
             'errors': 0,
             'last_update': None
@@ -88,28 +108,29 @@ class NikoCallbackService:
         self.logger.info("Stopping Niko callback service")
         # Callbacks remain registered but we just mark as not running
 
+        # Publish updates still waiting for their batch
+        self._flush_pending()
+
     def _initial_sync(self):
         """Perform initial sync of all devices and locations"""
         self.logger.info("Performing initial sync...")
 
         try:
+            # Devices and locations are written to Redis in one pipelined batch
+            batch = []
+
             # Sync devices
             devices_data = self.niko_api.list_devices()
             self.logger.info(f"Initial sync: Found {len(devices_data)} devices")
 
-            device_objects = []
             for device_data in devices_data:
                 try:
                     device = NikoDataConverter.create_device(device_data)
                     self.devices_cache[device.uuid] = device
-                    device_objects.append(device)
+                    batch.append((device, 'niko_device', {'device_uuid': device.uuid}))
                 except Exception as e:
                     self.logger.error(f"Error converting device: {e}")
 
-            # Publish all devices
-            count = self.redis_publisher.publish_all_niko_devices(device_objects)
-            self.logger.info(f"Published {count} devices to Redis")
-
             # Sync locations
             locations_data = self.niko_api.list_locations()
             self.logger.info(f"Initial sync: Found {len(locations_data)} locations")
@@ -123,10 +144,20 @@ class NikoCallbackService:
                         icon=location_data.get("Icon", "general")
                     )
                     self.locations_cache[location.uuid] = location
-                    self.redis_publisher.publish_niko_location(location)
+                    batch.append((location, 'niko_location', {'location_uuid': location.uuid}))
                 except Exception as e:
                     self.logger.error(f"Error converting location: {e}")
 
+            results = self.redis_publisher.publish_batch(batch)
+            if not results['failed']:
+                self._published.update(
+                    (item.uuid, item) for item, pattern_name, _ in batch if pattern_name == 'niko_device'
+                )
+            self.logger.info(
+                f"Published {results['success']} devices and locations to Redis "
+                f"({results['failed']} failed)"
+            )
+
             self.logger.info("Initial sync complete")
 
         except Exception as e:
@@ -152,49 +183,124 @@ class NikoCallbackService:
         self.logger.debug(f"Received device event: {method}, {len(devices)} devices")
 
         try:
-            for device_data in devices:
-                device_uuid = device_data.get('Uuid')
-
-                if method == 'devices.removed':
-                    # Remove from cache and Redis
-                    if device_uuid in self.devices_cache:
-                        del self.devices_cache[device_uuid]
-                    self.redis_publisher.delete_device('niko_device', device_uuid=device_uuid)
-                    self.logger.info(f"Removed device {device_uuid}")
-
-                else:
-                    # Add or update device
-                    try:
-                        device = NikoDataConverter.create_device(device_data)
-                        self.devices_cache[device.uuid] = device
-
-                        # Publish to Redis
-                        success = self.redis_publisher.publish_niko_device(device)
-
-                        if success:
-                            self.stats['device_updates'] += 1
-                            self.stats['last_update'] = datetime.now().isoformat()
-
-                            action = "Updated" if method == 'devices.changed' else "Added"
-                            self.logger.info(
-                                f"{action} device: {device.name} ({device.device_type}) "
-                                f"UUID: {device.uuid}"
-                            )
-
-                            # Log property changes if it's an update
-                            if method == 'devices.changed' and device.properties:
-                                self.logger.debug(f"Properties: {device.properties}")
-                        else:
-                            self.logger.error(f"Failed to publish device {device.uuid}")
-
-                    except Exception as e:
-                        self.logger.error(f"Error processing device {device_uuid}: {e}")
-                        self.stats['errors'] += 1
+            # Removals in this event share one Redis round trip
+            with self.redis_publisher.pipeline_context() as pipe:
+                for device_data in devices:
+                    device_uuid = device_data.get('Uuid')
+
+                    if method == 'devices.removed':
+                        # Remove from cache and Redis; a queued update must not re-create it
+                        if device_uuid in self.devices_cache:
+                            del self.devices_cache[device_uuid]
+                        with self._flush_lock, self._pending_lock:
+                            self._pending.pop(device_uuid, None)
+                            self._published.pop(device_uuid, None)
+                        self.redis_publisher.delete_device('niko_device', pipe=pipe, device_uuid=device_uuid)
+                        self.logger.info(f"Removed device {device_uuid}")
+
+                    else:
+                        # Add or update device
+                        try:
+                            device = NikoDataConverter.create_device(device_data)
+
+                            # Niko re-sends unchanged device state; nothing to publish then
+                            if method == 'devices.changed' and self._is_unchanged(device):
+                                self.stats['skipped_updates'] += 1
+                                continue
+
+                            self.devices_cache[device.uuid] = device
+
+                            # Published to Redis with the rest of the burst
+                            self._queue_publish(device, method)
+
+                        except Exception as e:
+                            self.logger.error(f"Error processing device {device_uuid}: {e}")
+                            self.stats['errors'] += 1
 
         except Exception as e:
             self.logger.error(f"Error handling device event: {e}", exc_info=True)
             self.stats['errors'] += 1
 
+    def _is_unchanged(self, device: NikoBaseDevice) -> bool:
+        """
+        Check whether a device update matches the state last published to
+        Redis. Not the cache: after a failed publish the cache is ahead of
+        Redis, and the next identical re-send must repair it.
+        """
+        previous = self._published.get(device.uuid)
+        return (
+            previous is not None and
+            type(previous) is type(device) and
+            self._published_state(previous) == self._published_state(device)
+        )
+
+    @staticmethod
+    def _published_state(device: NikoBaseDevice) -> Dict[str, Any]:
+        """Device representation as published, without the per-conversion id and timestamp"""
+        state = device.to_dict()
+        state.pop('id', None)
+        state.pop('timestamp', None)
+        return state
+
+    def _queue_publish(self, device: NikoBaseDevice, method: str):
+        """
+        Queue a device update for the next batched publish. The batch goes out
+        publish_delay after its first update, or at once when max_batch
+        devices are pending; repeated updates of a device keep only the latest.
+        """
+        with self._pending_lock:
+            self._pending[device.uuid] = (device, method)
+            flush_now = len(self._pending) >= self.max_batch
+            if not flush_now and self._flush_timer is None:
+                self._flush_timer = threading.Timer(self.publish_delay, self._flush_pending)
+                self._flush_timer.daemon = True
+                self._flush_timer.start()
+
+        if flush_now:
+            self._flush_pending()
+
+    def _flush_pending(self):
+        """Publish all pending device updates in one Redis pipeline"""
+        with self._flush_lock:
+            with self._pending_lock:
+                pending = self._pending
+                self._pending = {}
+                if self._flush_timer is not None:
+                    self._flush_timer.cancel()
+                    self._flush_timer = None
+
+            if not pending:
+                return
+
+            results = self.redis_publisher.publish_batch([
+                (device, 'niko_device', {'device_uuid': device.uuid})
+                for device, _ in pending.values()
+            ])
+
+            if results['failed']:
+                # publish_batch does not say which items failed; keep none of them
+                # as a baseline, so identical re-sends are published again
+                self.logger.error(f"Failed to publish {results['failed']} of {len(pending)} devices")
+                self.stats['errors'] += 1
+            else:
+                self._published.update((uuid, device) for uuid, (device, _) in pending.items())
+            if not results['success']:
+                return
+
+            self.stats['device_updates'] += results['success']
+            self.stats['last_update'] = datetime.now().isoformat()
+
+            for device, method in pending.values():
+                action = "Updated" if method == 'devices.changed' else "Added"
+                self.logger.info(
+                    f"{action} device: {device.name} ({device.device_type}) "
+                    f"UUID: {device.uuid}"
+                )
+
+                # Log property changes if it's an update
+                if method == 'devices.changed' and device.properties:
+                    self.logger.debug(f"Properties: {device.properties}")
+
     def _on_location_event(self, event_data: Dict[str, Any]):
         """Handle location events from Niko MQTT"""
         if not self.running:
@@ -206,35 +312,45 @@ class NikoCallbackService:
         self.logger.debug(f"Received location event: {method}, {len(locations)} locations")
 
         try:
-            for location_data in locations:
-                location_uuid = location_data.get('Uuid')
-
-                if method == 'locations.removed':
-                    if location_uuid in self.locations_cache:
-                        del self.locations_cache[location_uuid]
-                    self.redis_publisher.delete_device('niko_location', location_uuid=location_uuid)
-                    self.logger.info(f"Removed location {location_uuid}")
-
-                else:
-                    try:
-                        location = Location(
-                            uuid=location_uuid,
-                            name=location_data.get("Name", ""),
-                            index=int(location_data.get("Index", 0)),
-                            icon=location_data.get("Icon", "general")
-                        )
-                        self.locations_cache[location.uuid] = location
-
-                        success = self.redis_publisher.publish_niko_location(location)
-
-                        if success:
-                            self.stats['location_updates'] += 1
-                            action = "Updated" if method == 'locations.changed' else "Added"
-                            self.logger.info(f"{action} location: {location.name}")
-
-                    except Exception as e:
-                        self.logger.error(f"Error processing location {location_uuid}: {e}")
-                        self.stats['errors'] += 1
+            # All location writes of this event share one Redis round trip
+            with self.redis_publisher.pipeline_context() as pipe:
+                for location_data in locations:
+                    location_uuid = location_data.get('Uuid')
+
+                    if method == 'locations.removed':
+                        if location_uuid in self.locations_cache:
+                            del self.locations_cache[location_uuid]
+                        self.redis_publisher.delete_device('niko_location', pipe=pipe, location_uuid=location_uuid)
+                        self.logger.info(f"Removed location {location_uuid}")
+
+                    else:
+                        try:
+                            location = self.locations_cache.get(location_uuid)
+                            if location is not None:
+                                # Update the cached instance in place
+                                location.name = location_data.get("Name", "")
+                                location.index = int(location_data.get("Index", 0))
+                                location.icon = location_data.get("Icon", "general")
+                                location.timestamp = datetime.now().isoformat()
+                            else:
+                                location = Location(
+                                    uuid=location_uuid,
+                                    name=location_data.get("Name", ""),
+                                    index=int(location_data.get("Index", 0)),
+                                    icon=location_data.get("Icon", "general")
+                                )
+                                self.locations_cache[location.uuid] = location
+
+                            success = self.redis_publisher.publish_niko_location(location, pipe=pipe)
+
+                            if success:
+                                self.stats['location_updates'] += 1
+                                action = "Updated" if method == 'locations.changed' else "Added"
+                                self.logger.info(f"{action} location: {location.name}")
+
+                        except Exception as e:
+                            self.logger.error(f"Error processing location {location_uuid}: {e}")
+                            self.stats['errors'] += 1
 
         except Exception as e:
             self.logger.error(f"Error handling location event: {e}", exc_info=True)
@@ -308,32 +424,22 @@ class NikoCallbackService:
 
     def get_devices_by_location(self) -> Dict[str, List[NikoBaseDevice]]:
         """Get devices organized by location"""
-        result = {}
-
-        # Initialize with all locations
-        for location in self.locations_cache.values():
-            result[location.name] = []
+        # Start with all locations, so empty ones are listed too
+        result = defaultdict(list, {location.name: [] for location in self.locations_cache.values()})
 
-        # Add devices to their locations
         for device in self.devices_cache.values():
-            location_name = device.location_name or "Unknown"
-            if location_name not in result:
-                result[location_name] = []
-            result[location_name].append(device)
+            result[device.location_name or "Unknown"].append(device)
 
-        return result
+        return dict(result)
 
     def get_devices_by_type(self) -> Dict[str, List[NikoBaseDevice]]:
         """Get devices organized by type"""
-        result = {}
+        result = defaultdict(list)
 
         for device in self.devices_cache.values():
-            device_type = device.device_type
-            if device_type not in result:
-                result[device_type] = []
-            result[device_type].append(device)
+            result[device.device_type].append(device)
 
-        return result
+        return dict(result)
 
 class SmartHomeService:
     """